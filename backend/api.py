@@ -3,67 +3,243 @@ NetraAI Investigation API
 FastAPI backend for government-grade investigative platform
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Dict, Any
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
+from typing import Callable, Iterator, List, Dict, Any, Optional, Set, Tuple
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
+import numpy as np
+import asyncio
+import orjson
 import os
 
 from config import config
 from models import (
     DashboardStats, CompanyProfile, DirectorProfile, TenderProfile,
-    NetworkGraph, NetworkNode, NetworkEdge, EntityDetail, InvestigationSummary,
+    NetworkGraph, EntityDetail, InvestigationSummary,
     RiskCategory, EntityType, RiskIndicator
 )
 from risk_engine import RiskScoringEngine
+from data_loader import load_dataset, dataset_version
+from batching import AsyncBatcher
+from graph_kernels import NUMBA_AVAILABLE, build_csr, bfs_csr
+
+# orjson for response bodies; newer FastAPI already writes response models straight
+# to bytes via Pydantic and deprecates ORJSONResponse, so keep its default there
+DEFAULT_RESPONSE_CLASS = JSONResponse if getattr(ORJSONResponse, '__deprecated__', None) else ORJSONResponse
 
 # Initialize FastAPI
 app = FastAPI(
     title=config.API_TITLE,
     version=config.API_VERSION,
-    description=config.API_DESCRIPTION
+    description=config.API_DESCRIPTION,
+    default_response_class=DEFAULT_RESPONSE_CLASS
 )
 
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=config.CORS_ORIGINS,
+    allow_origin_regex=config.CORS_ORIGIN_REGEX,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+# Worker threads for CPU-bound pandas/risk work so the event loop stays free
+THREAD_POOL = ThreadPoolExecutor(max_workers=os.cpu_count())
+
 # Load data
 data_cache = {}
 risk_engine = None
+risk_batcher: Optional[AsyncBatcher] = None
+
+# Integer entity kinds, keyed by the first four characters of an ID
+KIND_COMPANY, KIND_DIRECTOR, KIND_TENDER, KIND_DEPARTMENT, KIND_UNKNOWN = 0, 1, 2, 3, -1
+KIND_BY_PREFIX = {'COMP': KIND_COMPANY, 'DIR_': KIND_DIRECTOR, 'TEND': KIND_TENDER, 'DEPT': KIND_DEPARTMENT}
+
+# Display entity types keyed by ID prefix
+ENTITY_TYPE_BY_PREFIX = {
+    'COMP_': EntityType.COMPANY, 'DIR_': EntityType.DIRECTOR,
+    'TEND_': EntityType.TENDER, 'DEPT_': EntityType.DEPARTMENT,
+}
+
+# Enum members by value - a dict hit instead of Enum.__call__ per row
+RISK_CATEGORY_BY_VALUE = {category.value: category for category in RiskCategory}
+
+# Column order of CompanyProfile rows built from the companies/risk frames
+COMPANY_PROFILE_COLS = list(CompanyProfile.model_fields)
+
+# Nodes/edges encoded per chunk of the streamed network graph response
+STREAM_CHUNK_SIZE = 256
+
+# Data-derived responses only change on reload, so clients may reuse them for a minute
+CACHE_CONTROL = 'public, max-age=60'
+
+# (data_version, clusters) - recomputed only when the dataset files change
+_clusters_cache: Optional[Tuple[str, List[List[str]]]] = None
+
+# (company_id, data_version) -> (risk_score, confidence, indicators); cleared on reload
+_risk_memo: Dict[Tuple[str, str], Tuple[float, float, List[RiskIndicator]]] = {}
+
+# Columns each dataset must provide - everything else is pruned at read time
+REQUIRED_COLS = {
+    'companies': ['company_id', 'name', 'registration_year', 'industry_type', 'address', 'fraud_label'],
+    'directors': ['director_id', 'name'],
+    'tenders': ['tender_id', 'contract_value', 'year'],
+    'departments': ['department_id', 'name'],
+    'relationships': ['source_id', 'target_id', 'relationship_type'],
+}
 
 def load_data():
     """Load all datasets"""
     global data_cache, risk_engine
     
-    print("  Loading CSV files...")
-    data_cache['companies'] = pd.read_csv(os.path.join(config.DATA_DIR, 'companies.csv'))
-    data_cache['directors'] = pd.read_csv(os.path.join(config.DATA_DIR, 'directors.csv'))
-    data_cache['tenders'] = pd.read_csv(os.path.join(config.DATA_DIR, 'tenders.csv'))
-    data_cache['departments'] = pd.read_csv(os.path.join(config.DATA_DIR, 'departments.csv'))
-    data_cache['relationships'] = pd.read_csv(os.path.join(config.DATA_DIR, 'relationships.csv'))
+    print("  Loading datasets (Parquet)...")
+    data_cache['data_version'] = dataset_version()
+    for name, columns in REQUIRED_COLS.items():
+        data_cache[name] = load_dataset(name, columns=columns, compact=True)
+    
+    # Sorted lookup indexes - O(log N + k) per entity instead of a full scan
+    relationships = data_cache['relationships'].rename_axis('rel_idx').reset_index()
+    data_cache['rel_by_source'] = relationships.set_index('source_id', drop=False).sort_index(kind='stable')
+    data_cache['rel_by_target'] = relationships.set_index('target_id', drop=False).sort_index(kind='stable')
+    data_cache['tenders_by_id'] = data_cache['tenders'].set_index('tender_id', drop=False)
+    
+    # Entity kinds as small ints so hot paths never compare string prefixes
+    data_cache['entity_kind'] = {
+        **dict.fromkeys(data_cache['companies']['company_id'], KIND_COMPANY),
+        **dict.fromkeys(data_cache['directors']['director_id'], KIND_DIRECTOR),
+        **dict.fromkeys(data_cache['tenders']['tender_id'], KIND_TENDER),
+        **dict.fromkeys(data_cache['departments']['department_id'], KIND_DEPARTMENT),
+    }
+    # Display labels for companies and directors; other entities show their ID
+    data_cache['labels'] = {
+        **dict(zip(data_cache['companies']['company_id'], data_cache['companies']['name'])),
+        **dict(zip(data_cache['directors']['director_id'], data_cache['directors']['name'])),
+    }
+    
+    relationships = data_cache['relationships']
+    for end in ('source', 'target'):
+        relationships[f'{end}_kind'] = (
+            relationships[f'{end}_id'].str[:4].map(KIND_BY_PREFIX).fillna(KIND_UNKNOWN).astype('int8')
+        )
+    comp_edges = relationships[
+        (relationships['source_kind'] == KIND_COMPANY) & (relationships['target_kind'] == KIND_COMPANY)
+    ][['source_id', 'target_id', 'relationship_type']].reset_index(drop=True)
+    
+    # Integer node codes on company edges so subgraph filters are bitmap lookups
+    comp_nodes = pd.Categorical(pd.concat([comp_edges['source_id'], comp_edges['target_id']]).unique())
+    comp_edges['src_code'] = comp_nodes.categories.get_indexer(comp_edges['source_id']).astype(np.int32)
+    comp_edges['tgt_code'] = comp_nodes.categories.get_indexer(comp_edges['target_id']).astype(np.int32)
+    data_cache['comp_node_index'] = comp_nodes.categories
+    data_cache['comp_edges'] = comp_edges
+    data_cache['comp_edge_records'] = comp_edges[['source_id', 'target_id', 'relationship_type']].to_dict('records')
+    
+    # Undirected adjacency plus company-to-company edges for network traversal
+    adjacency = defaultdict(list)
+    for source, target in relationships[['source_id', 'target_id']].itertuples(index=False, name=None):
+        adjacency[source].append(target)
+        adjacency[target].append(source)
+    
+    comp_edges_by_node = defaultdict(list)
+    for edge_id, (source, target) in enumerate(comp_edges[['source_id', 'target_id']].itertuples(index=False, name=None)):
+        comp_edges_by_node[source].append(edge_id)
+        comp_edges_by_node[target].append(edge_id)
+    
+    data_cache['adjacency'] = dict(adjacency)
+    data_cache['comp_edges_by_node'] = dict(comp_edges_by_node)
+    data_cache['company_ids'] = frozenset(data_cache['companies']['company_id'])
+    data_cache['avg_degree'] = 2 * len(data_cache['relationships']) / max(len(adjacency), 1)
+    
+    # CSR arrays for the compiled traversal kernel (warmed up here, not per request)
+    if NUMBA_AVAILABLE:
+        node_ids = list(dict.fromkeys([*data_cache['companies']['company_id'], *adjacency]))
+        indptr, indices, is_company, node_index = build_csr(adjacency, node_ids, data_cache['company_ids'])
+        data_cache['csr'] = (indptr, indices, is_company)
+        data_cache['csr_node_ids'] = np.array(node_ids, dtype=object)
+        data_cache['csr_node_index'] = node_index
+        bfs_csr(0, indptr, indices, is_company, 1, 50, data_cache['avg_degree'])
     
     print("  Initializing risk engine...")
     risk_engine = RiskScoringEngine(data_cache)
+    _risk_memo.clear()
     
     # Calculate risk scores (this may take a moment)
     print("  Calculating risk scores for all entities...")
     risk_scores = risk_engine.calculate_all_risk_scores()
+    risk_scores['risk_category'] = risk_scores['risk_category'].astype('category')
     data_cache['risk_scores'] = risk_scores
     print(f"  Risk scores calculated for {len(risk_scores)} companies")
+    
+    # Risk scores keyed by company for Series.map, plus per-category row masks
+    risk_scores_indexed = risk_scores.set_index('company_id')
+    data_cache['risk_scores_indexed'] = risk_scores_indexed
+    data_cache['risk_by_id'] = risk_scores_indexed[['risk_score', 'risk_category']].to_dict('index')
+    company_categories = data_cache['companies']['company_id'].map(risk_scores_indexed['risk_category'])
+    data_cache['category_masks'] = {
+        category: (company_categories == category).to_numpy()
+        for category in company_categories.dropna().unique()
+    }
+    
+    # Fraud clusters: company position -> cluster id, plus the /api/clusters body
+    print("  Detecting fraud clusters...")
+    clusters = _get_clusters()
+    company_index = pd.Index(data_cache['companies']['company_id'])
+    cluster_of = np.full(len(company_index), -1, dtype=np.int32)
+    for cluster_id, members in enumerate(clusters):
+        codes = company_index.get_indexer(members)
+        cluster_of[codes[codes >= 0]] = cluster_id
+    data_cache['company_index'] = company_index
+    data_cache['cluster_of'] = cluster_of
+    data_cache['clusters_json'] = orjson.dumps({
+        "clusters": [
+            {'cluster_id': i, 'size': len(cluster), 'members': cluster[:10]}  # Limit to 10 for display
+            for i, cluster in enumerate(clusters)
+        ],
+        "total_clusters": len(clusters)
+    })
+    
+    # Dashboard inputs are immutable until the next load, so aggregate them once
+    print("  Pre-aggregating dashboard statistics...")
+    tenders = data_cache['tenders']
+    data_cache['dashboard_stats'] = DashboardStats(
+        total_entities=len(data_cache['companies']) + len(data_cache['directors']),
+        high_risk_count=int((risk_scores['risk_category'] == 'High').sum()),
+        fraud_cluster_count=len(clusters),
+        total_tenders=len(tenders),
+        total_contract_value=float(tenders['contract_value'].sum()),
+        risk_distribution=risk_scores['risk_category'].value_counts().to_dict()
+    )
 
 @app.on_event("startup")
 async def startup_event():
     """Load data on startup"""
+    global risk_batcher
     print("Loading NetraAI data...")
     load_data()
+    
+    # Concurrent risk-score lookups share one bulk engine call per 5 ms window
+    risk_batcher = AsyncBatcher(
+        _calculate_risk_scores,
+        max_batch=64, max_wait_ms=5, executor=THREAD_POOL
+    )
+    risk_batcher.start()
     print("✓ NetraAI API initialized successfully")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release worker threads on shutdown"""
+    if risk_batcher is not None:
+        await risk_batcher.stop()
+    THREAD_POOL.shutdown(wait=False)
+
+async def _run_in_pool(func: Callable, *args):
+    """Run a blocking helper on the worker pool"""
+    return await asyncio.get_running_loop().run_in_executor(THREAD_POOL, func, *args)
+
 @app.get("/")
 async def root():
     """API root endpoint"""
@@ -74,105 +250,81 @@ async def root():
     }
 
 @app.get("/api/dashboard/stats", response_model=DashboardStats)
-async def get_dashboard_stats():
+async def get_dashboard_stats(request: Request, response: Response):
     """Get dashboard overview statistics"""
-    companies = data_cache['companies']
-    tenders = data_cache['tenders']
-    risk_scores = data_cache['risk_scores']
-    
-    # Detect fraud clusters
-    fraud_clusters = risk_engine.detect_fraud_clusters()
-    
-    # Risk distribution
-    risk_dist = risk_scores['risk_category'].value_counts().to_dict()
+    if _is_not_modified(request):
+        return _not_modified_response()
     
-    return DashboardStats(
-        total_entities=len(companies) + len(data_cache['directors']),
-        high_risk_count=len(risk_scores[risk_scores['risk_category'] == 'High']),
-        fraud_cluster_count=len(fraud_clusters),
-        total_tenders=len(tenders),
-        total_contract_value=float(tenders['contract_value'].sum()),
-        risk_distribution=risk_dist
-    )
+    response.headers.update(_cache_headers())
+    return data_cache['dashboard_stats']
 
 @app.get("/api/companies", response_model=List[CompanyProfile])
 async def get_companies(risk_category: str = None, limit: int = 100):
     """Get list of companies with risk scores"""
     companies = data_cache['companies']
-    risk_scores = data_cache['risk_scores']
-    
-    # Merge data
-    merged = companies.merge(risk_scores, on='company_id')
+    risk_scores_indexed = data_cache['risk_scores_indexed']
     
-    # Filter by risk category
+    # Filter by risk category using the precomputed mask
     if risk_category:
-        merged = merged[merged['risk_category'] == risk_category]
-    
-    # Limit results
-    merged = merged.head(limit)
-    
-    results = []
-    for _, row in merged.iterrows():
-        results.append(CompanyProfile(
-            company_id=row['company_id'],
-            name=row['name'],
-            registration_year=int(row['registration_year']),
-            industry_type=row['industry_type'],
-            address=row['address'],
-            risk_score=float(row['risk_score']),
-            risk_category=RiskCategory(row['risk_category']),
-            confidence_score=float(row['confidence_score']),
-            fraud_label=int(row['fraud_label'])
-        ))
-    
-    return results
+        mask = data_cache['category_masks'].get(risk_category)
+        companies = companies[mask] if mask is not None else companies.iloc[0:0]
+    
+    # Limit results before attaching risk data
+    filtered = companies.head(limit)
+    company_ids = filtered['company_id']
+    merged = filtered.assign(
+        risk_score=company_ids.map(risk_scores_indexed['risk_score']),
+        risk_category=company_ids.map(risk_scores_indexed['risk_category']),
+        confidence_score=company_ids.map(risk_scores_indexed['confidence_score'])
+    )
+    
+    # Data comes from our own risk engine, so per-field validation is skipped
+    records = merged[COMPANY_PROFILE_COLS].to_dict('records')
+    for record in records:
+        record['risk_category'] = RISK_CATEGORY_BY_VALUE[record['risk_category']]
+    return [CompanyProfile.model_construct(**record) for record in records]
 
 @app.get("/api/company/{company_id}", response_model=EntityDetail)
-async def get_company_detail(company_id: str):
+async def get_company_detail(company_id: str, request: Request, response: Response):
     """Get detailed company profile"""
-    companies = data_cache['companies']
-    relationships = data_cache['relationships']
-    
-    company = companies[companies['company_id'] == company_id]
-    if company.empty:
+    if company_id not in data_cache['company_ids']:
         raise HTTPException(status_code=404, detail="Company not found")
     
-    company = company.iloc[0]
+    if _is_not_modified(request):
+        return _not_modified_response()
+    response.headers.update(_cache_headers())
     
     # Calculate risk score
-    risk_score, confidence, indicators = risk_engine.calculate_company_risk_score(company_id)
+    risk_score, confidence, indicators = await _get_risk_score(company_id)
+    return await _run_in_pool(_get_company_detail_sync, company_id, risk_score, indicators)
+
+def _get_company_detail_sync(company_id: str, risk_score: float,
+                             indicators: List[RiskIndicator]) -> EntityDetail:
+    """Blocking implementation of get_company_detail"""
     risk_category = risk_engine.get_risk_category(risk_score)
     
     # Get connected entities
-    connected = relationships[
-        (relationships['source_id'] == company_id) | 
-        (relationships['target_id'] == company_id)
-    ]
+    connected = _get_connected_relationships(company_id)
     
     connected_entities = []
-    for _, rel in connected.head(20).iterrows():
-        entity_id = rel['target_id'] if rel['source_id'] == company_id else rel['source_id']
+    for source, target, relationship_type in connected.head(20)[
+        ['source_id', 'target_id', 'relationship_type']
+    ].itertuples(index=False, name=None):
         connected_entities.append({
-            'entity_id': entity_id,
-            'relationship_type': rel['relationship_type']
+            'entity_id': target if source == company_id else source,
+            'relationship_type': relationship_type
         })
     
     # Get tender history
-    won_tenders = relationships[
-        (relationships['source_id'] == company_id) &
-        (relationships['relationship_type'] == 'WON')
+    won_tenders = connected[
+        (connected['source_id'] == company_id) &
+        (connected['relationship_type'] == 'WON')
     ]
     
-    tender_history = []
-    for _, rel in won_tenders.iterrows():
-        tender = data_cache['tenders'][data_cache['tenders']['tender_id'] == rel['target_id']]
-        if not tender.empty:
-            tender = tender.iloc[0]
-            tender_history.append({
-                'tender_id': tender['tender_id'],
-                'contract_value': float(tender['contract_value']),
-                'year': int(tender['year'])
-            })
+    # Single indexed join against the tender table
+    history = data_cache['tenders_by_id'].reindex(won_tenders['target_id'].to_numpy())
+    history = history.dropna(subset=['tender_id']).astype({'contract_value': float, 'year': int})
+    tender_history = history[['tender_id', 'contract_value', 'year']].to_dict('records')
     
     return EntityDetail(
         entity_id=company_id,
@@ -187,99 +339,104 @@ async def get_company_detail(company_id: str):
 @app.get("/api/network/graph", response_model=NetworkGraph)
 async def get_network_graph(entity_id: str = None, depth: int = 2):
     """Get network graph for visualization"""
-    relationships = data_cache['relationships']
+    nodes, edges = await _run_in_pool(_get_network_graph_sync, entity_id, depth)
+    return StreamingResponse(_stream_network_graph(nodes, edges), media_type='application/json')
+
+def _get_network_graph_sync(entity_id: str = None,
+                            depth: int = 2) -> Tuple[List[Dict[str, Any]], List[Dict[str, str]]]:
+    """Blocking implementation of get_network_graph"""
     risk_scores = data_cache['risk_scores']
-    companies = data_cache['companies']
+    entity_kind = data_cache['entity_kind']
+    risk_by_id = data_cache['risk_by_id']
     
     if entity_id:
         # Get subgraph around entity - only include companies
-        nodes_to_include = {entity_id}
-        edges = []
-        
-        for _ in range(depth):
-            new_nodes = set()
-            for node in nodes_to_include:
-                connected = relationships[
-                    (relationships['source_id'] == node) | 
-                    (relationships['target_id'] == node)
-                ]
-                for _, rel in connected.iterrows():
-                    # Only include company nodes
-                    if rel['source_id'].startswith('COMP_'):
-                        new_nodes.add(rel['source_id'])
-                    if rel['target_id'].startswith('COMP_'):
-                        new_nodes.add(rel['target_id'])
-                    edges.append(rel)
-            nodes_to_include.update(new_nodes)
-            
-            if len(nodes_to_include) > 50:  # Limit graph size
-                break
-        
-        # Filter to only company nodes
-        nodes_to_include = {n for n in nodes_to_include if n.startswith('COMP_')}
+        nodes_to_include, edges = _traverse_company_network(entity_id, depth)
     else:
         # Get high-risk entities (companies only)
         high_risk = risk_scores[risk_scores['risk_category'] == 'High'].head(20)
         nodes_to_include = set(high_risk['company_id'].tolist())
         
-        edges = relationships[
-            (relationships['source_id'].isin(nodes_to_include) & relationships['target_id'].isin(nodes_to_include))
-        ].to_dict('records')
+        comp_edges = data_cache['comp_edges']
+        node_index = data_cache['comp_node_index']
+        codes = node_index.get_indexer(list(nodes_to_include))
+        bitmap = np.zeros(len(node_index), dtype=bool)
+        bitmap[codes[codes >= 0]] = True
+        
+        mask = bitmap[comp_edges['src_code'].to_numpy()] & bitmap[comp_edges['tgt_code'].to_numpy()]
+        edges = comp_edges.loc[mask, ['source_id', 'target_id', 'relationship_type']].to_dict('records')
     
     # Build nodes - only companies
     nodes = []
     for node_id in nodes_to_include:
-        if not node_id.startswith('COMP_'):
+        if entity_kind.get(node_id) != KIND_COMPANY:
             continue
             
         node_type = EntityType.COMPANY
         risk_score = 0.0
         risk_category = RiskCategory.LOW
         
-        risk_data = risk_scores[risk_scores['company_id'] == node_id]
-        if not risk_data.empty:
-            risk_score = float(risk_data.iloc[0]['risk_score'])
-            risk_category = RiskCategory(risk_data.iloc[0]['risk_category'])
-        
-        nodes.append(NetworkNode(
-            id=node_id,
-            label=_get_entity_label(node_id, data_cache),
-            type=node_type,
-            risk_score=risk_score,
-            risk_category=risk_category
-        ))
-    
-    # Build edges - only between companies
-    network_edges = []
-    for edge in edges:
-        if isinstance(edge, pd.Series):
-            edge = edge.to_dict()
+        risk_data = risk_by_id.get(node_id)
+        if risk_data is not None:
+            risk_score = float(risk_data['risk_score'])
+            risk_category = RISK_CATEGORY_BY_VALUE[risk_data['risk_category']]
         
-        # Only include edges between companies
-        if edge['source_id'].startswith('COMP_') and edge['target_id'].startswith('COMP_'):
-            if edge['source_id'] in nodes_to_include and edge['target_id'] in nodes_to_include:
-                network_edges.append(NetworkEdge(
-                    source=edge['source_id'],
-                    target=edge['target_id'],
-                    relationship_type=edge['relationship_type']
-                ))
+        # Plain dicts in NetworkNode field order - encoded as they are streamed
+        nodes.append({
+            'id': node_id,
+            'label': _get_entity_label(node_id, data_cache),
+            'type': node_type,
+            'risk_score': risk_score,
+            'risk_category': risk_category
+        })
     
-    return NetworkGraph(nodes=nodes, edges=network_edges)
+    # Build edges - both branches already hold company-to-company edges only
+    network_edges = [
+        {
+            'source': edge['source_id'],
+            'target': edge['target_id'],
+            'relationship_type': edge['relationship_type']
+        }
+        for edge in edges
+        if edge['source_id'] in nodes_to_include and edge['target_id'] in nodes_to_include
+    ]
+    
+    return nodes, network_edges
+
+def _stream_network_graph(nodes: List[Dict[str, Any]], edges: List[Dict[str, str]]) -> Iterator[bytes]:
+    """Encode a NetworkGraph body incrementally"""
+    yield b'{"nodes":['
+    yield from _encode_json_items(nodes)
+    yield b'],"edges":['
+    yield from _encode_json_items(edges)
+    yield b']}'
+
+def _encode_json_items(items: List[Dict[str, Any]]) -> Iterator[bytes]:
+    """Comma-joined JSON array elements, STREAM_CHUNK_SIZE items per chunk"""
+    for start in range(0, len(items), STREAM_CHUNK_SIZE):
+        chunk = b','.join(orjson.dumps(item) for item in items[start:start + STREAM_CHUNK_SIZE])
+        yield chunk if start == 0 else b',' + chunk
 
 @app.get("/api/investigation/summary/{entity_id}", response_model=InvestigationSummary)
-async def generate_investigation_summary(entity_id: str):
+async def generate_investigation_summary(entity_id: str, request: Request, response: Response):
     """Generate investigation summary for an entity"""
     if not entity_id.startswith('COMP_'):
         raise HTTPException(status_code=400, detail="Only company investigations supported")
     
-    companies = data_cache['companies']
-    company = companies[companies['company_id'] == entity_id]
-    
-    if company.empty:
+    if entity_id not in data_cache['company_ids']:
         raise HTTPException(status_code=404, detail="Company not found")
     
+    if _is_not_modified(request):
+        return _not_modified_response()
+    response.headers.update(_cache_headers())
+    
     # Calculate risk
-    risk_score, confidence, indicators = risk_engine.calculate_company_risk_score(entity_id)
+    risk_score, confidence, indicators = await _get_risk_score(entity_id)
+    return await _run_in_pool(_generate_investigation_summary_sync, entity_id, risk_score, indicators)
+
+def _generate_investigation_summary_sync(entity_id: str, risk_score: float,
+                                         indicators: List[RiskIndicator]) -> InvestigationSummary:
+    """Blocking implementation of generate_investigation_summary"""
     risk_category = risk_engine.get_risk_category(risk_score)
     
     # Generate key findings
@@ -287,20 +444,14 @@ async def generate_investigation_summary(entity_id: str):
     for indicator in indicators:
         key_findings.append(f"{indicator.indicator}: {indicator.description}")
     
-    # Find connected suspicious entities
-    relationships = data_cache['relationships']
-    connected = relationships[
-        (relationships['source_id'] == entity_id) | 
-        (relationships['target_id'] == entity_id)
-    ]
+    # Find connected suspicious entities - one vectorized pass over the neighbours
+    connected = _get_connected_relationships(entity_id)
+    sources = connected['source_id'].to_numpy()
+    other_ids = pd.Series(np.where(sources == entity_id, connected['target_id'].to_numpy(), sources))
     
-    suspicious_entities = []
-    for _, rel in connected.iterrows():
-        other_id = rel['target_id'] if rel['source_id'] == entity_id else rel['source_id']
-        if other_id.startswith('COMP_'):
-            other_risk = risk_scores[risk_scores['company_id'] == other_id]
-            if not other_risk.empty and other_risk.iloc[0]['risk_category'] == 'High':
-                suspicious_entities.append(other_id)
+    # Only companies carry risk scores, so non-company neighbours map to NaN
+    other_category = other_ids.map(data_cache['risk_scores_indexed']['risk_category'])
+    suspicious_entities = other_ids[(other_category == 'High').to_numpy()].tolist()
     
     # Generate recommendation
     if risk_category == RiskCategory.HIGH:
@@ -322,43 +473,152 @@ async def generate_investigation_summary(entity_id: str):
     )
 
 @app.get("/api/clusters")
-async def get_fraud_clusters():
+async def get_fraud_clusters(request: Request):
     """Get detected fraud clusters"""
-    clusters = risk_engine.detect_fraud_clusters()
-    
-    result = []
-    for i, cluster in enumerate(clusters):
-        cluster_info = {
-            'cluster_id': i,
-            'size': len(cluster),
-            'members': cluster[:10]  # Limit to 10 for display
-        }
-        result.append(cluster_info)
+    if _is_not_modified(request):
+        return _not_modified_response()
+    
+    # Serialized once at load time - nothing to encode per request
+    return Response(content=data_cache['clusters_json'], media_type='application/json',
+                    headers=_cache_headers())
+
+async def _get_risk_score(company_id: str) -> Tuple[float, float, List[RiskIndicator]]:
+    """Memoized risk score, computed through the batcher on a miss"""
+    cached = _risk_memo.get((company_id, data_cache['data_version']))
+    if cached is not None:
+        return cached
+    return await risk_batcher.submit(company_id)
+
+def _calculate_risk_scores(company_ids: List[str]) -> List[Tuple[float, float, List[RiskIndicator]]]:
+    """Bulk risk scoring for the batcher - only memo misses reach the engine"""
+    version = data_cache['data_version']
+    missing = [company_id for company_id in company_ids if (company_id, version) not in _risk_memo]
+    if missing:
+        for company_id, result in zip(missing, risk_engine.calculate_risk_scores_bulk(missing)):
+            _risk_memo[(company_id, version)] = result
+    return [_risk_memo[(company_id, version)] for company_id in company_ids]
+
+def _cache_headers() -> Dict[str, str]:
+    """ETag/Cache-Control headers for responses derived from the loaded data"""
+    return {'ETag': f'"{data_cache["data_version"]}"', 'Cache-Control': CACHE_CONTROL}
+
+def _is_not_modified(request: Request) -> bool:
+    """Check whether the client already holds the current data version"""
+    if_none_match = request.headers.get('if-none-match')
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+    return '*' in tags or f'"{data_cache["data_version"]}"' in tags
+
+def _not_modified_response() -> Response:
+    """Empty 304 carrying the same validators as the full response"""
+    return Response(status_code=304, headers=_cache_headers())
+
+def _get_clusters() -> List[List[str]]:
+    """Get fraud clusters, running community detection once per dataset version"""
+    global _clusters_cache
+    version = data_cache['data_version']
+    if _clusters_cache is None or _clusters_cache[0] != version:
+        _clusters_cache = (version, risk_engine.detect_fraud_clusters())
+    return _clusters_cache[1]
+
+def _get_connected_relationships(entity_id: str) -> pd.DataFrame:
+    """Get relationships touching an entity via the sorted source/target indexes"""
+    parts = []
+    for index_key in ('rel_by_source', 'rel_by_target'):
+        try:
+            parts.append(data_cache[index_key].loc[[entity_id]])
+        except KeyError:
+            continue
+    
+    if not parts:
+        return data_cache['rel_by_source'].iloc[0:0]
+    
+    # Restore original row order so results match the unindexed scan
+    return pd.concat(parts).drop_duplicates('rel_idx').sort_values('rel_idx')
+
+def _traverse_company_network(entity_id: str, depth: int,
+                              max_nodes: int = 50) -> Tuple[Set[str], List[Dict[str, str]]]:
+    """Collect companies reachable from an entity, plus the company edges seen"""
+    if 'csr' not in data_cache:
+        return _traverse_company_network_dict(entity_id, depth, max_nodes)
+    
+    start = data_cache['csr_node_index'].get(entity_id)
+    if start is None:
+        return set(), []
+    
+    indptr, indices, is_company = data_cache['csr']
+    visited, expanded = bfs_csr(start, indptr, indices, is_company, depth, max_nodes, data_cache['avg_degree'])
+    
+    node_ids = data_cache['csr_node_ids']
+    comp_edges_by_node = data_cache['comp_edges_by_node']
+    edge_ids = set()
+    for node in node_ids[expanded]:
+        edge_ids.update(comp_edges_by_node.get(node, ()))
+    
+    comp_edge_records = data_cache['comp_edge_records']
+    nodes = set(node_ids[visited & is_company])
+    return nodes, [comp_edge_records[i] for i in sorted(edge_ids)]
+
+def _traverse_company_network_dict(entity_id: str, depth: int,
+                                   max_nodes: int = 50) -> Tuple[Set[str], List[Dict[str, str]]]:
+    """Pure-Python direction-optimizing BFS, used when Numba is unavailable"""
+    adjacency = data_cache['adjacency']
+    company_ids = data_cache['company_ids']
+    comp_edges_by_node = data_cache['comp_edges_by_node']
+    
+    visited = {entity_id}
+    frontier = [entity_id]
+    edge_ids = set()
+    visited_companies = 1 if entity_id in company_ids else 0
+    
+    for _ in range(depth):
+        if not frontier:
+            break
+        
+        for node in frontier:
+            edge_ids.update(comp_edges_by_node.get(node, ()))
+        
+        unvisited_count = len(company_ids) - visited_companies
+        if len(frontier) * data_cache['avg_degree'] > unvisited_count:
+            # Bottom-up: cheaper to ask each unvisited company for a parent
+            frontier_set = set(frontier)
+            next_frontier = [
+                company_id for company_id in company_ids
+                if company_id not in visited
+                and any(neighbor in frontier_set for neighbor in adjacency.get(company_id, ()))
+            ]
+            visited.update(next_frontier)
+        else:
+            # Top-down: expand each frontier node's neighbours
+            next_frontier = []
+            for node in frontier:
+                for neighbor in adjacency.get(node, ()):
+                    if neighbor in company_ids and neighbor not in visited:
+                        visited.add(neighbor)
+                        next_frontier.append(neighbor)
+        
+        visited_companies += len(next_frontier)
+        frontier = next_frontier
+        
+        if len(visited) > max_nodes:  # Limit graph size
+            break
     
-    return {"clusters": result, "total_clusters": len(clusters)}
+    comp_edge_records = data_cache['comp_edge_records']
+    nodes = {node for node in visited if node in company_ids}
+    return nodes, [comp_edge_records[i] for i in sorted(edge_ids)]
 
 def _get_entity_type(entity_id: str) -> EntityType:
     """Get entity type from ID"""
-    if entity_id.startswith('COMP_'):
-        return EntityType.COMPANY
-    elif entity_id.startswith('DIR_'):
-        return EntityType.DIRECTOR
-    elif entity_id.startswith('TEND_'):
-        return EntityType.TENDER
-    elif entity_id.startswith('DEPT_'):
-        return EntityType.DEPARTMENT
-    return EntityType.COMPANY
+    # 'DIR_' is the only four-character prefix, so it gets the second lookup
+    return ENTITY_TYPE_BY_PREFIX.get(entity_id[:5]) or ENTITY_TYPE_BY_PREFIX.get(entity_id[:4], EntityType.COMPANY)
 
 def _get_entity_label(entity_id: str, data: Dict) -> str:
     """Get entity label for display"""
-    if entity_id.startswith('COMP_'):
-        company = data['companies'][data['companies']['company_id'] == entity_id]
-        return company.iloc[0]['name'] if not company.empty else entity_id
-    elif entity_id.startswith('DIR_'):
-        director = data['directors'][data['directors']['director_id'] == entity_id]
-        return director.iloc[0]['name'] if not director.empty else entity_id
-    return entity_id
+    return data['labels'].get(entity_id, entity_id)
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Import string so uvicorn can spawn worker processes; "auto" picks uvloop/httptools from requirements.txt
+    # (uvloop has no Windows build). Production runs under gunicorn -k uvicorn.workers.UvicornWorker
+    uvicorn.run("api:app", host="0.0.0.0", port=8000, loop="auto", http="auto", workers=config.API_WORKERS)
@@ -0,0 +1,77 @@
+"""
+NetraAI Request Batching
+Coalesces concurrent single-entity calls into one bulk call
+"""
+
+import asyncio
+from concurrent.futures import Executor
+from typing import Any, Callable, List, Optional
+
+class AsyncBatcher:
+    """Collect submitted keys for a short window and resolve them with one bulk call"""
+
+    def __init__(self, bulk_func: Callable[[List[Any]], List[Any]], max_batch: int = 64,
+                 max_wait_ms: float = 5, executor: Optional[Executor] = None):
+        self.bulk_func = bulk_func
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.executor = executor
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the background drain task on the running loop"""
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Cancel the drain task and fail anything still queued"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.cancel()
+
+    async def submit(self, key: Any) -> Any:
+        """Queue a key and wait for its result from the next batch"""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((key, future))
+        return await future
+
+    async def _run(self):
+        """Drain the queue every max_wait_ms or once max_batch items are waiting"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Duplicate keys in one window are computed once
+            keys = list(dict.fromkeys(key for key, _ in batch))
+            try:
+                results = await loop.run_in_executor(self.executor, self.bulk_func, keys)
+            except Exception as exc:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+
+            by_key = dict(zip(keys, results))
+            for key, future in batch:
+                if not future.done():
+                    future.set_result(by_key[key])
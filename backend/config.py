@@ -1,15 +1,22 @@
 import os
-from typing import Optional
+from typing import List, Optional
 
 class Config:
-    # Neo4j Configuration (Aura Cloud)
+    # Deployment environment - Render sets RENDER on every service
+    ENVIRONMENT: str = os.getenv("ENVIRONMENT", "production" if os.getenv("RENDER") else "development")
+    
+    # Neo4j Configuration (Aura Cloud) - credentials come from the environment only
     NEO4J_URI: str = os.getenv("NEO4J_URI", "neo4j+s://ce4768b6.databases.neo4j.io")
     NEO4J_USER: str = os.getenv("NEO4J_USER", "neo4j")
-    NEO4J_PASSWORD: str = os.getenv("NEO4J_PASSWORD", "_pZBi1mHZrnXxYexLgi1tcHN-zRbDX97jqVcc3P3TNA")
+    NEO4J_PASSWORD: str = os.getenv("NEO4J_PASSWORD", "")
     NEO4J_DATABASE: str = os.getenv("NEO4J_DATABASE", "neo4j")
+    NEO4J_POOL_WARMUP: int = int(os.getenv("NEO4J_POOL_WARMUP", 4))
+    NEO4J_MAX_POOL_SIZE: int = int(os.getenv("NEO4J_MAX_POOL_SIZE", 20))
+    NEO4J_LOAD_WORKERS: int = int(os.getenv("NEO4J_LOAD_WORKERS", 10))
     
     # Data paths
     DATA_DIR: str = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "raw")
+    PARQUET_DIR: str = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "processed")
     
     # Risk scoring thresholds
     RISK_THRESHOLD_HIGH: float = 0.7
@@ -19,6 +26,21 @@ class Config:
     API_TITLE: str = "NetraAI Investigation API"
     API_VERSION: str = "1.0.0"
     API_DESCRIPTION: str = "AI-powered investigative intelligence system for proactive corruption detection"
+    API_WORKERS: int = int(os.getenv("API_WORKERS", os.cpu_count() or 1))
+    
+    # CORS - exact origins plus a regex for Render preview deploys (list entries never match wildcards)
+    CORS_ORIGINS: List[str] = [
+        origin.strip()
+        for origin in os.getenv("CORS_ORIGINS", "http://localhost:3000,https://netraai-frontend.onrender.com").split(",")
+        if origin.strip()
+    ]
+    CORS_ORIGIN_REGEX: str = os.getenv("CORS_ORIGIN_REGEX", r"^https://netraai-frontend(-[a-z0-9]+)?\.onrender\.com$")
+    
+    # Token required by /api/admin/refresh; unset leaves the endpoint open only in development
+    ADMIN_TOKEN: str = os.getenv("ADMIN_TOKEN", "")
+    
+    # Fixed seed so every worker process detects the same fraud clusters
+    CLUSTER_RANDOM_STATE: int = 42
     
     # Model paths
     MODEL_DIR: str = os.path.join(os.path.dirname(os.path.dirname(__file__)), "models")
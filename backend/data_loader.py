@@ -0,0 +1,85 @@
+"""
+NetraAI Dataset Loader
+Columnar (Parquet) access to the raw procurement datasets
+"""
+
+import pandas as pd
+import numpy as np
+import hashlib
+import os
+from typing import Dict, List, Optional
+from config import config
+
+DATASETS = ['companies', 'directors', 'tenders', 'departments', 'relationships']
+
+# Compact dtypes - small ints and categorical codes keep scans cache-resident.
+# Integer targets are only applied when every value is whole and in range (see _compact_dtypes)
+COLUMN_DTYPES = {
+    'registration_year': 'int16',
+    'fraud_label': 'int8',
+    'year': 'int16',
+    'contract_value': 'int32',
+    'industry_type': 'category',
+    'relationship_type': 'category',
+}
+
+# PyArrow's multithreaded CSV parser when installed, pandas' C parser otherwise
+try:
+    import pyarrow  # noqa: F401
+    CSV_ENGINE = 'pyarrow'
+except ImportError:
+    CSV_ENGINE = 'c'
+
+def ensure_parquet(name: str) -> str:
+    """Convert a raw CSV to Parquet once and return the Parquet path"""
+    csv_path = os.path.join(config.DATA_DIR, f'{name}.csv')
+    parquet_path = os.path.join(config.PARQUET_DIR, f'{name}.parquet')
+    
+    # Re-convert only when the CSV is newer than the cached Parquet file
+    if not os.path.exists(parquet_path) or os.path.getmtime(parquet_path) < os.path.getmtime(csv_path):
+        os.makedirs(config.PARQUET_DIR, exist_ok=True)
+        pd.read_csv(csv_path, engine='pyarrow').to_parquet(parquet_path, engine='pyarrow', compression='zstd', index=False)
+    
+    return parquet_path
+
+def load_dataset(name: str, columns: Optional[List[str]] = None,
+                 filters: Optional[List[tuple]] = None, compact: bool = False) -> pd.DataFrame:
+    """Load a dataset, materializing only the requested columns/rows"""
+    try:
+        path = ensure_parquet(name)
+        df = pd.read_parquet(path, engine='pyarrow', columns=columns, filters=filters)
+    except (ImportError, OSError):
+        # pyarrow missing or data directory read-only - fall back to CSV
+        df = pd.read_csv(os.path.join(config.DATA_DIR, f'{name}.csv'), usecols=columns, engine=CSV_ENGINE)
+    
+    if compact:
+        df = df.astype(_compact_dtypes(df))
+    return df
+
+def _compact_dtypes(df: pd.DataFrame) -> Dict[str, str]:
+    """COLUMN_DTYPES entries for df's columns that convert without truncating or overflowing"""
+    dtypes = {}
+    for col, dtype in COLUMN_DTYPES.items():
+        if col not in df.columns:
+            continue
+        if dtype.startswith('int') and len(df[col]):
+            values = df[col]
+            limits = np.iinfo(dtype)
+            if not ((values % 1 == 0).all() and limits.min <= values.min() and values.max() <= limits.max):
+                # Fractional or out-of-range data keeps its parsed dtype
+                continue
+        dtypes[col] = dtype
+    return dtypes
+
+def dataset_version(names: List[str] = DATASETS) -> str:
+    """Short hash of the raw dataset mtimes - changes whenever any CSV is rewritten"""
+    mtimes = [os.path.getmtime(os.path.join(config.DATA_DIR, f'{name}.csv')) for name in names]
+    return hashlib.md5(str(mtimes).encode()).hexdigest()[:8]
+
+def convert_all() -> Dict[str, str]:
+    """One-time bootstrap: write Parquet copies of every raw CSV"""
+    return {name: ensure_parquet(name) for name in DATASETS}
+
+if __name__ == "__main__":
+    for name, path in convert_all().items():
+        print(f"✓ {name}: {path}")
@@ -5,43 +5,84 @@ GCN-based fraud detection model
 
 import torch
 import torch.nn.functional as F
-from torch_geometric.nn import GCNConv, global_mean_pool
-from torch_geometric.data import HeteroData, Data
+from torch_geometric.nn import GCNConv
+from torch_geometric.nn.conv.gcn_conv import gcn_norm
+from torch_geometric.data import Data
+from torch_geometric.utils import to_torch_csr_tensor
 import pandas as pd
 import numpy as np
-from typing import Dict, Tuple
-from sklearn.preprocessing import StandardScaler
+from typing import Dict, Optional, Tuple
+
+# Numeric feature columns per node, shared by every node type so they stack into one matrix.
+# Was 5 while the categorical and director-name hashes were numeric columns; checkpoints
+# saved with the old width will not load into the current model
+NUM_NODE_FEATURES = 4
+
+# Categorical node attributes, fed to the model as integer codes through embeddings
+CATEGORICAL_FEATURES = ('industry_type', 'address', 'department_id')
+EMBED_DIM = 8
+
+# Dataset columns GraphDataProcessor reads
+GNN_COLUMNS = {
+    'companies': ('company_id', 'registration_year', 'industry_type', 'address', 'fraud_label'),
+    'directors': ('director_id', 'age'),
+    'tenders': ('tender_id', 'department_id', 'contract_value', 'year'),
+    'relationships': ('source_id', 'target_id'),
+}
+
+def _relu_dropout(x: torch.Tensor, p: float, training: bool) -> torch.Tensor:
+    """ReLU followed by dropout as one fusable elementwise step"""
+    return F.dropout(torch.relu(x), p=p, training=training)
+
+# TorchScript fuses the pair on PyTorch 1.x; on 2.x torch.compile fuses it instead,
+# and a scripted function would only cause a graph break there
+if not hasattr(torch, 'compile'):
+    _relu_dropout = torch.jit.script(_relu_dropout)
 
 class FraudDetectionGCN(torch.nn.Module):
     """Graph Convolutional Network for fraud detection"""
     
-    def __init__(self, input_dim: int, hidden_dim: int = 64, output_dim: int = 2):
+    def __init__(self, input_dim: int, hidden_dim: int = 64, output_dim: int = 2,
+                 cat_cardinalities: Tuple[int, ...] = (), embed_dim: int = EMBED_DIM):
         super(FraudDetectionGCN, self).__init__()
-        self.conv1 = GCNConv(input_dim, hidden_dim)
-        self.conv2 = GCNConv(hidden_dim, hidden_dim)
-        self.conv3 = GCNConv(hidden_dim, hidden_dim)
+        # One embedding per categorical column; index 0 is "not applicable" for the node type
+        self.embeddings = torch.nn.ModuleList(
+            torch.nn.Embedding(cardinality + 1, embed_dim, padding_idx=0) for cardinality in cat_cardinalities
+        )
+        # adj_t arrives normalized (see prepare_graph_data), so the layers skip gcn_norm
+        self.conv1 = GCNConv(input_dim + embed_dim * len(cat_cardinalities), hidden_dim,
+                             normalize=False, add_self_loops=False)
+        self.conv2 = GCNConv(hidden_dim, hidden_dim, normalize=False, add_self_loops=False)
+        self.conv3 = GCNConv(hidden_dim, hidden_dim, normalize=False, add_self_loops=False)
         self.fc = torch.nn.Linear(hidden_dim, output_dim)
         self.dropout = torch.nn.Dropout(0.3)
         
-    def forward(self, x, edge_index):
+    def forward(self, x, adj_t, cat=None):
+        # Concatenate categorical embeddings with the numeric features
+        if cat is not None and len(self.embeddings) > 0:
+            x = torch.cat([x] + [emb(cat[:, i]) for i, emb in enumerate(self.embeddings)], dim=1)
+        
         # First GCN layer
-        x = self.conv1(x, edge_index)
-        x = F.relu(x)
-        x = self.dropout(x)
+        x = self._conv(self.conv1, x, adj_t)
+        x = _relu_dropout(x, self.dropout.p, self.training)
         
         # Second GCN layer
-        x = self.conv2(x, edge_index)
-        x = F.relu(x)
-        x = self.dropout(x)
+        x = self._conv(self.conv2, x, adj_t)
+        x = _relu_dropout(x, self.dropout.p, self.training)
         
         # Third GCN layer
-        x = self.conv3(x, edge_index)
+        x = self._conv(self.conv3, x, adj_t)
         x = F.relu(x)
         
         # Classification layer
         x = self.fc(x)
         
         return F.log_softmax(x, dim=1)
+    
+    def _conv(self, conv: GCNConv, x: torch.Tensor, adj_t: torch.Tensor) -> torch.Tensor:
+        """GCN layer in float32: adj_t is a float32 sparse CSR matrix and sparse matmul has no autocast rule"""
+        with torch.autocast(device_type=x.device.type, enabled=False):
+            return conv(x.float(), adj_t)
 
 class GraphDataProcessor:
     """Process tabular data into PyTorch Geometric format"""
@@ -51,7 +92,14 @@ class GraphDataProcessor:
         self.directors = data['directors']
         self.tenders = data['tenders']
         self.relationships = data['relationships']
-        self.scaler = StandardScaler()
+        self.feature_mean = None
+        self.feature_std = None
+        
+        # Compact integer codes per category - no hash collisions, stable across runs
+        self.industry_codes, self.industry_uniques = pd.factorize(self.companies['industry_type'])
+        self.address_codes, self.address_uniques = pd.factorize(self.companies['address'])
+        self.department_codes, self.department_uniques = pd.factorize(self.tenders['department_id'])
+        self.cat_cardinalities = (len(self.industry_uniques), len(self.address_uniques), len(self.department_uniques))
         
     def prepare_graph_data(self) -> Data:
         """Convert data to PyTorch Geometric Data object"""
@@ -62,33 +110,48 @@ class GraphDataProcessor:
         tender_ids = self.tenders['tender_id'].tolist()
         
         all_nodes = company_ids + director_ids + tender_ids
-        node_to_idx = {node: idx for idx, node in enumerate(all_nodes)}
-        
-        # Prepare node features
-        company_features = self._extract_company_features()
-        director_features = self._extract_director_features()
-        tender_features = self._extract_tender_features()
-        
-        # Combine all features
-        all_features = np.vstack([company_features, director_features, tender_features])
-        
-        # Normalize features
-        all_features = self.scaler.fit_transform(all_features)
+        # Hashed index over node IDs - positions are looked up a whole column at a time
+        node_index = pd.Index(all_nodes)
+        
+        # Prepare node features - each extractor fills its own row block, so there is no vstack copy
+        all_features = np.zeros((len(all_nodes), NUM_NODE_FEATURES), dtype=np.float32)
+        director_start = len(company_ids)
+        tender_start = director_start + len(director_ids)
+        self._extract_company_features(all_features[:director_start])
+        self._extract_director_features(all_features[director_start:tender_start])
+        self._extract_tender_features(all_features[tender_start:])
+        
+        # Normalize features in place in float32 (population std, constant columns left unscaled)
+        self.feature_mean = all_features.mean(axis=0)
+        self.feature_std = all_features.std(axis=0)
+        self.feature_std[self.feature_std == 0] = 1.0
+        all_features -= self.feature_mean
+        all_features /= self.feature_std
         
         # Prepare labels (only for companies)
-        labels = np.zeros(len(all_nodes), dtype=np.long)
-        labels[:len(company_ids)] = self.companies['fraud_label'].values
+        labels = np.zeros(len(all_nodes), dtype=np.int64)
+        labels[:len(company_ids)] = self.companies['fraud_label'].to_numpy(dtype=np.int64)
         
         # Prepare edges
-        edge_index = self._build_edge_index(node_to_idx)
+        edge_index = self._build_edge_index(node_index)
         
-        # Create PyG Data object
+        # Create PyG Data object - from_numpy shares the arrays' memory instead of copying
         data = Data(
-            x=torch.FloatTensor(all_features),
-            edge_index=torch.LongTensor(edge_index),
-            y=torch.LongTensor(labels)
+            x=torch.from_numpy(all_features),
+            edge_index=torch.from_numpy(edge_index),
+            y=torch.from_numpy(labels)
         )
         
+        # CSR adjacency built once - GCNConv dispatches it to a fused sparse matmul
+        # instead of scattering over the COO edge list every forward pass
+        data.adj_t = to_torch_csr_tensor(data.edge_index, size=(len(all_nodes), len(all_nodes)))
+        
+        # The graph is static, so D^-1/2 (A + I) D^-1/2 is computed here once rather than
+        # by every GCNConv layer on every epoch
+        data.adj_t, _ = gcn_norm(data.adj_t, num_nodes=len(all_nodes), add_self_loops=True)
+        
+        data.cat = torch.from_numpy(self._categorical_codes(len(all_nodes)))
+        
         # Create train/val/test masks (only for companies)
         num_companies = len(company_ids)
         train_size = int(0.6 * num_companies)
@@ -106,102 +169,121 @@ class GraphDataProcessor:
         data.val_mask = val_mask
         data.test_mask = test_mask
         
+        # Mask sizes as plain ints, so accuracy needs no extra device sync for the denominator
+        data.train_size = train_size
+        data.val_size = val_size
+        data.test_size = num_companies - train_size - val_size
+        
         return data
     
-    def _extract_company_features(self) -> np.ndarray:
-        """Extract numerical features for companies"""
-        features = []
+    def _extract_company_features(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Extract numerical features for companies, into the zeroed `out` block if given"""
+        features = np.zeros((len(self.companies), NUM_NODE_FEATURES), dtype=np.float32) if out is None else out
         
-        for _, company in self.companies.iterrows():
-            # Registration year (normalized)
-            reg_year = (company['registration_year'] - 1995) / (2023 - 1995)
-            
-            # Industry type (one-hot encoded - simplified to hash)
-            industry_hash = hash(company['industry_type']) % 10 / 10.0
-            
-            # Address hash (for shell company detection)
-            address_hash = hash(company['address']) % 100 / 100.0
-            
-            # Degree features (will be computed from graph)
-            features.append([reg_year, industry_hash, address_hash, 0.0, 0.0])
+        # Registration year (normalized)
+        features[:, 0] = (self.companies['registration_year'].to_numpy() - 1995) / (2023 - 1995)
         
-        return np.array(features)
+        # Industry and address (shell company detection) are categorical codes, see _categorical_codes
+        # Degree features (columns 2-3, will be computed from graph)
+        return features
     
-    def _extract_director_features(self) -> np.ndarray:
-        """Extract numerical features for directors"""
-        features = []
+    def _extract_director_features(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Extract numerical features for directors, into the zeroed `out` block if given"""
+        features = np.zeros((len(self.directors), NUM_NODE_FEATURES), dtype=np.float32) if out is None else out
         
-        for _, director in self.directors.iterrows():
-            # Age (normalized)
-            age_norm = (director['age'] - 30) / (75 - 30)
-            
-            # Name hash
-            name_hash = hash(director['name']) % 100 / 100.0
-            
-            features.append([age_norm, name_hash, 0.0, 0.0, 0.0])
+        # Age (normalized)
+        features[:, 0] = (self.directors['age'].to_numpy() - 30) / (75 - 30)
         
-        return np.array(features)
+        # The director name hash is deliberately not a feature: names are effectively unique,
+        # so it (or an embedding of it) would only let the model memorise node identities
+        return features
     
-    def _extract_tender_features(self) -> np.ndarray:
-        """Extract numerical features for tenders"""
-        features = []
+    def _extract_tender_features(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Extract numerical features for tenders, into the zeroed `out` block if given"""
+        features = np.zeros((len(self.tenders), NUM_NODE_FEATURES), dtype=np.float32) if out is None else out
         
-        for _, tender in self.tenders.iterrows():
-            # Contract value (log-normalized)
-            value_norm = np.log1p(tender['contract_value']) / np.log1p(5000000)
-            
-            # Year (normalized)
-            year_norm = (tender['year'] - 2018) / (2023 - 2018)
-            
-            # Department hash
-            dept_hash = hash(tender['department_id']) % 20 / 20.0
-            
-            features.append([value_norm, year_norm, dept_hash, 0.0, 0.0])
+        # Contract value (log-normalized)
+        features[:, 0] = np.log1p(self.tenders['contract_value'].to_numpy(dtype=np.float64)) / np.log1p(5000000)
+        
+        # Year (normalized)
+        features[:, 1] = (self.tenders['year'].to_numpy() - 2018) / (2023 - 2018)
         
-        return np.array(features)
+        # Department is a categorical code, see _categorical_codes
+        return features
     
-    def _build_edge_index(self, node_to_idx: Dict[str, int]) -> np.ndarray:
+    def _categorical_codes(self, num_nodes: int) -> np.ndarray:
+        """Per-node codes for CATEGORICAL_FEATURES, shifted by one so 0 means not applicable"""
+        codes = np.zeros((num_nodes, len(CATEGORICAL_FEATURES)), dtype=np.int64)
+        num_companies = len(self.companies)
+        tender_start = num_companies + len(self.directors)
+        
+        codes[:num_companies, 0] = self.industry_codes + 1
+        codes[:num_companies, 1] = self.address_codes + 1
+        codes[tender_start:tender_start + len(self.tenders), 2] = self.department_codes + 1
+        return codes
+    
+    def _build_edge_index(self, node_index: pd.Index) -> np.ndarray:
         """Build edge index for PyG"""
-        edges = []
+        # get_indexer returns int64 positions with -1 for unknown IDs - no float/NaN round trip
+        source = node_index.get_indexer(self.relationships['source_id'])
+        target = node_index.get_indexer(self.relationships['target_id'])
         
-        for _, rel in self.relationships.iterrows():
-            source = rel['source_id']
-            target = rel['target_id']
-            
-            if source in node_to_idx and target in node_to_idx:
-                source_idx = node_to_idx[source]
-                target_idx = node_to_idx[target]
-                
-                # Add bidirectional edges
-                edges.append([source_idx, target_idx])
-                edges.append([target_idx, source_idx])
-        
-        return np.array(edges).T
+        # Keep edges whose endpoints are both known nodes
+        valid = (source >= 0) & (target >= 0)
+        source = source[valid].astype(np.int64, copy=False)
+        target = target[valid].astype(np.int64, copy=False)
+        
+        # Add bidirectional edges
+        return np.concatenate([np.stack([source, target]), np.stack([target, source])], axis=1)
+
+def _compile_model(model: FraudDetectionGCN) -> torch.nn.Module:
+    """Fuse the GCN's elementwise ops with torch.compile where available (PyTorch 2.x)"""
+    if not hasattr(torch, 'compile'):
+        return model
+    
+    # TF32 matmuls on Ampere+; autotuning only pays off on GPU, the graph shape never changes
+    torch.set_float32_matmul_precision('high')
+    mode = 'max-autotune' if torch.cuda.is_available() else 'default'
+    return torch.compile(model, mode=mode, dynamic=False)
+
+def _accuracy(pred: torch.Tensor, y: torch.Tensor, mask: torch.Tensor, size: int) -> float:
+    """Share of masked nodes predicted correctly, with a single device sync"""
+    return (pred[mask] == y[mask]).sum().item() / size if size > 0 else 0.0
 
 def train_model(data: Data, model: FraudDetectionGCN, epochs: int = 200):
     """Train the GCN model"""
     optimizer = torch.optim.Adam(model.parameters(), lr=0.01, weight_decay=5e-4)
     
-    model.train()
+    # The compiled wrapper shares parameters with `model`, which is returned for saving
+    compiled = _compile_model(model)
+    
+    # Mixed precision on CUDA: bf16 where supported, else fp16 with loss scaling. Only the dense
+    # layers (embeddings, classifier) run reduced; the GCN propagation stays float32, see FraudDetectionGCN._conv
+    use_amp = data.x.is_cuda
+    amp_dtype = torch.bfloat16 if use_amp and torch.cuda.is_bf16_supported() else torch.float16
+    grad_scaler = torch.cuda.amp.GradScaler(enabled=use_amp and amp_dtype == torch.float16)
+    
+    compiled.train()
     for epoch in range(epochs):
         optimizer.zero_grad()
-        out = model(data.x, data.edge_index)
-        
-        # Only compute loss on training nodes
-        loss = F.nll_loss(out[data.train_mask], data.y[data.train_mask])
-        loss.backward()
-        optimizer.step()
+        # Autocast keeps log_softmax / nll_loss in float32
+        with torch.autocast(device_type='cuda', dtype=amp_dtype, enabled=use_amp):
+            out = compiled(data.x, data.adj_t, data.cat)
+            
+            # Only compute loss on training nodes
+            loss = F.nll_loss(out[data.train_mask], data.y[data.train_mask])
+        grad_scaler.scale(loss).backward()
+        grad_scaler.step(optimizer)
+        grad_scaler.update()
         
         if (epoch + 1) % 20 == 0:
-            # Evaluate
-            model.eval()
+            # Progress accuracy from this step's training-mode output - no second forward pass
             with torch.no_grad():
-                pred = model(data.x, data.edge_index).argmax(dim=1)
-                train_acc = (pred[data.train_mask] == data.y[data.train_mask]).sum().item() / data.train_mask.sum().item()
-                val_acc = (pred[data.val_mask] == data.y[data.val_mask]).sum().item() / data.val_mask.sum().item()
+                pred = out.detach().argmax(dim=1)
+                train_acc = _accuracy(pred, data.y, data.train_mask, data.train_size)
+                val_acc = _accuracy(pred, data.y, data.val_mask, data.val_size)
             
             print(f'Epoch {epoch+1:03d}, Loss: {loss:.4f}, Train Acc: {train_acc:.4f}, Val Acc: {val_acc:.4f}')
-            model.train()
     
     return model
 
@@ -209,17 +291,19 @@ def evaluate_model(data: Data, model: FraudDetectionGCN):
     """Evaluate model performance"""
     model.eval()
     with torch.no_grad():
-        pred = model(data.x, data.edge_index).argmax(dim=1)
+        pred = model(data.x, data.adj_t, data.cat).argmax(dim=1)
         
-        test_acc = (pred[data.test_mask] == data.y[data.test_mask]).sum().item() / data.test_mask.sum().item()
+        test_acc = _accuracy(pred, data.y, data.test_mask, data.test_size)
         
-        # Calculate precision, recall for fraud class
+        # Calculate precision, recall for fraud class - one transfer for all three counts
         test_pred = pred[data.test_mask]
         test_true = data.y[data.test_mask]
         
-        tp = ((test_pred == 1) & (test_true == 1)).sum().item()
-        fp = ((test_pred == 1) & (test_true == 0)).sum().item()
-        fn = ((test_pred == 0) & (test_true == 1)).sum().item()
+        tp, fp, fn = torch.stack([
+            ((test_pred == 1) & (test_true == 1)).sum(),
+            ((test_pred == 1) & (test_true == 0)).sum(),
+            ((test_pred == 0) & (test_true == 1)).sum()
+        ]).tolist()
         
         precision = tp / (tp + fp) if (tp + fp) > 0 else 0
         recall = tp / (tp + fn) if (tp + fn) > 0 else 0
@@ -238,14 +322,13 @@ if __name__ == "__main__":
     sys.path.append(os.path.dirname(__file__))
     
     from config import config
+    from data_loader import load_dataset
     
-    # Load data
+    # Load data - only the columns the feature extractors read, in compact dtypes
     print("Loading data...")
     data_dict = {
-        'companies': pd.read_csv(os.path.join(config.DATA_DIR, 'companies.csv')),
-        'directors': pd.read_csv(os.path.join(config.DATA_DIR, 'directors.csv')),
-        'tenders': pd.read_csv(os.path.join(config.DATA_DIR, 'tenders.csv')),
-        'relationships': pd.read_csv(os.path.join(config.DATA_DIR, 'relationships.csv'))
+        name: load_dataset(name, columns=list(columns), compact=True)
+        for name, columns in GNN_COLUMNS.items()
     }
     
     # Prepare graph data
@@ -256,9 +339,13 @@ if __name__ == "__main__":
     print(f"Graph: {graph_data.num_nodes} nodes, {graph_data.num_edges} edges")
     print(f"Features: {graph_data.x.shape}")
     
+    # Move the whole graph to the device once; training never transfers again
+    device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+    graph_data = graph_data.to(device, non_blocking=True)
+    
     # Initialize model
     print("\nInitializing GCN model...")
-    model = FraudDetectionGCN(input_dim=graph_data.x.shape[1])
+    model = FraudDetectionGCN(input_dim=graph_data.x.shape[1], cat_cardinalities=processor.cat_cardinalities).to(device)
     
     # Train model
     print("\nTraining model...")
@@ -0,0 +1,94 @@
+"""
+NetraAI Graph Kernels
+Compiled traversal kernels over CSR adjacency arrays
+"""
+
+import numpy as np
+from typing import Dict, List, Tuple
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in so kernels still run as plain Python"""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+def build_csr(adjacency: Dict[str, List[str]], node_ids: List[str],
+              company_ids: frozenset) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, int]]:
+    """Build CSR arrays holding each node's company neighbours"""
+    node_index = {node_id: idx for idx, node_id in enumerate(node_ids)}
+    is_company = np.fromiter((node_id in company_ids for node_id in node_ids), dtype=np.bool_, count=len(node_ids))
+
+    indptr = np.zeros(len(node_ids) + 1, dtype=np.int32)
+    indices = []
+    for idx, node_id in enumerate(node_ids):
+        neighbors = [node_index[n] for n in adjacency.get(node_id, ()) if n in company_ids]
+        indices.extend(neighbors)
+        indptr[idx + 1] = len(indices)
+
+    return indptr, np.asarray(indices, dtype=np.int32), is_company, node_index
+
+@njit(cache=True)
+def bfs_csr(start: int, indptr: np.ndarray, indices: np.ndarray, is_company: np.ndarray,
+            depth: int, max_nodes: int, avg_degree: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Direction-optimizing BFS; returns visited and expanded node masks"""
+    n = len(indptr) - 1
+    visited = np.zeros(n, dtype=np.bool_)
+    expanded = np.zeros(n, dtype=np.bool_)
+    in_frontier = np.zeros(n, dtype=np.bool_)
+    frontier = np.empty(n, dtype=np.int32)
+    next_frontier = np.empty(n, dtype=np.int32)
+
+    frontier[0] = start
+    size = 1
+    visited[start] = True
+    visited_count = 1
+    unvisited_companies = is_company.sum() - (1 if is_company[start] else 0)
+
+    for level in range(depth):
+        if size == 0:
+            break
+
+        for i in range(size):
+            expanded[frontier[i]] = True
+
+        next_size = 0
+        # Bottom-up needs an all-company frontier, which holds from level 1 on
+        if level > 0 and size * avg_degree > unvisited_companies:
+            for i in range(size):
+                in_frontier[frontier[i]] = True
+            for node in range(n):
+                if is_company[node] and not visited[node]:
+                    for j in range(indptr[node], indptr[node + 1]):
+                        if in_frontier[indices[j]]:
+                            next_frontier[next_size] = node
+                            next_size += 1
+                            break
+            for i in range(size):
+                in_frontier[frontier[i]] = False
+            for i in range(next_size):
+                visited[next_frontier[i]] = True
+        else:
+            for i in range(size):
+                node = frontier[i]
+                for j in range(indptr[node], indptr[node + 1]):
+                    neighbor = indices[j]
+                    if not visited[neighbor]:
+                        visited[neighbor] = True
+                        next_frontier[next_size] = neighbor
+                        next_size += 1
+
+        visited_count += next_size
+        unvisited_companies -= next_size
+        frontier, next_frontier = next_frontier, frontier
+        size = next_size
+
+        if visited_count > max_nodes:
+            break
+
+    return visited, expanded
@@ -4,9 +4,26 @@ Loads synthetic data into Neo4j graph database
 """
 
 import pandas as pd
+import json
+import math
 import os
-from typing import Dict, List
+from typing import Any, Dict, Iterable, Iterator, List, TextIO, Tuple
 from config import config
+from data_loader import load_dataset
+
+# Rows per UNWIND batch - one parameterised query per batch instead of one query per row
+BATCH_SIZE = 5000
+
+# Node type by entity ID prefix (the part before the first underscore)
+NODE_TYPE_BY_PREFIX = {'COMP': 'Company', 'DIR': 'Director', 'TEND': 'Tender', 'DEPT': 'Department'}
+
+# Node label and stored properties per dataset
+NODE_PROPERTIES = {
+    'companies': ('Company', ('company_id', 'name', 'registration_year', 'industry_type', 'address', 'fraud_label')),
+    'directors': ('Director', ('director_id', 'name', 'age', 'fraud_label')),
+    'tenders': ('Tender', ('tender_id', 'department_id', 'contract_value', 'year', 'winning_company_id', 'fraud_label')),
+    'departments': ('Department', ('department_id', 'name', 'location')),
+}
 
 class GraphDatabaseLoader:
     def __init__(self):
@@ -16,125 +33,99 @@ class GraphDatabaseLoader:
         """Load all CSV datasets"""
         print("Loading datasets...")
         
-        companies = pd.read_csv(os.path.join(self.data_dir, 'companies.csv'))
-        directors = pd.read_csv(os.path.join(self.data_dir, 'directors.csv'))
-        tenders = pd.read_csv(os.path.join(self.data_dir, 'tenders.csv'))
-        departments = pd.read_csv(os.path.join(self.data_dir, 'departments.csv'))
-        relationships = pd.read_csv(os.path.join(self.data_dir, 'relationships.csv'))
-        
-        return {
-            'companies': companies,
-            'directors': directors,
-            'tenders': tenders,
-            'departments': departments,
-            'relationships': relationships
+        # Only the columns that become node properties or edges are materialized
+        data = {
+            dataset: load_dataset(dataset, columns=list(columns), compact=True)
+            for dataset, (_, columns) in NODE_PROPERTIES.items()
         }
+        data['relationships'] = load_dataset(
+            'relationships', columns=['source_id', 'target_id', 'relationship_type'], compact=True
+        )
+        return data
     
-    def generate_cypher_queries(self, data: Dict[str, pd.DataFrame]) -> List[str]:
-        """Generate Cypher queries for Neo4j"""
-        queries = []
-        
+    def generate_cypher_queries(self, data: Dict[str, pd.DataFrame]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (query, parameters) pairs for Neo4j - one UNWIND per batch of rows"""
         # Clear existing data
-        queries.append("MATCH (n) DETACH DELETE n")
+        yield "MATCH (n) DETACH DELETE n", {}
         
         # Create constraints
-        queries.append("CREATE CONSTRAINT company_id IF NOT EXISTS FOR (c:Company) REQUIRE c.company_id IS UNIQUE")
-        queries.append("CREATE CONSTRAINT director_id IF NOT EXISTS FOR (d:Director) REQUIRE d.director_id IS UNIQUE")
-        queries.append("CREATE CONSTRAINT tender_id IF NOT EXISTS FOR (t:Tender) REQUIRE t.tender_id IS UNIQUE")
-        queries.append("CREATE CONSTRAINT dept_id IF NOT EXISTS FOR (d:Department) REQUIRE d.department_id IS UNIQUE")
+        yield "CREATE CONSTRAINT company_id IF NOT EXISTS FOR (c:Company) REQUIRE c.company_id IS UNIQUE", {}
+        yield "CREATE CONSTRAINT director_id IF NOT EXISTS FOR (d:Director) REQUIRE d.director_id IS UNIQUE", {}
+        yield "CREATE CONSTRAINT tender_id IF NOT EXISTS FOR (t:Tender) REQUIRE t.tender_id IS UNIQUE", {}
+        yield "CREATE CONSTRAINT dept_id IF NOT EXISTS FOR (d:Department) REQUIRE d.department_id IS UNIQUE", {}
         
-        # Create Company nodes
-        for _, row in data['companies'].iterrows():
-            query = f"""
-            CREATE (c:Company {{
-                company_id: '{row['company_id']}',
-                name: '{row['name'].replace("'", "\\'")}',
-                registration_year: {row['registration_year']},
-                industry_type: '{row['industry_type']}',
-                address: '{row['address'].replace("'", "\\'")}',
-                fraud_label: {row['fraud_label']}
-            }})
-            """
-            queries.append(query)
+        # Create nodes - values travel as parameters, so quotes in names need no escaping
+        for dataset, (label, columns) in NODE_PROPERTIES.items():
+            query = f"UNWIND $rows AS r CREATE (n:{label}) SET n = r"
+            for batch in _batches(data[dataset][list(columns)]):
+                yield query, {'rows': batch}
         
-        # Create Director nodes
-        for _, row in data['directors'].iterrows():
+        # Create relationships, one query shape per (source type, target type, relationship type)
+        relationships = data['relationships'].assign(
+            source_type=self._get_node_types(data['relationships']['source_id']),
+            target_type=self._get_node_types(data['relationships']['target_id'])
+        )
+        groups = relationships.groupby(['source_type', 'target_type', 'relationship_type'], observed=True, sort=False)
+        for (source_type, target_type, rel_type), group in groups:
             query = f"""
-            CREATE (d:Director {{
-                director_id: '{row['director_id']}',
-                name: '{row['name'].replace("'", "\\'")}',
-                age: {row['age']},
-                fraud_label: {row['fraud_label']}
-            }})
+            UNWIND $rows AS r
+            MATCH (s:{source_type} {{{source_type.lower()}_id: r.source_id}})
+            MATCH (t:{target_type} {{{target_type.lower()}_id: r.target_id}})
+            CREATE (s)-[:`{rel_type}`]->(t)
             """
-            queries.append(query)
-        
-        # Create Tender nodes
-        for _, row in data['tenders'].iterrows():
-            query = f"""
-            CREATE (t:Tender {{
-                tender_id: '{row['tender_id']}',
-                department_id: '{row['department_id']}',
-                contract_value: {row['contract_value']},
-                year: {row['year']},
-                winning_company_id: '{row['winning_company_id']}',
-                fraud_label: {row['fraud_label']}
-            }})
-            """
-            queries.append(query)
-        
-        # Create Department nodes
-        for _, row in data['departments'].iterrows():
-            query = f"""
-            CREATE (d:Department {{
-                department_id: '{row['department_id']}',
-                name: '{row['name'].replace("'", "\\'")}',
-                location: '{row['location'].replace("'", "\\'")}'
-            }})
-            """
-            queries.append(query)
-        
-        # Create relationships
-        for _, row in data['relationships'].iterrows():
-            rel_type = row['relationship_type']
-            source = row['source_id']
-            target = row['target_id']
-            
-            # Determine node types
-            source_type = self._get_node_type(source)
-            target_type = self._get_node_type(target)
-            
-            query = f"""
-            MATCH (s:{source_type} {{{source_type.lower()}_id: '{source}'}})
-            MATCH (t:{target_type} {{{target_type.lower()}_id: '{target}'}})
-            CREATE (s)-[:{rel_type}]->(t)
-            """
-            queries.append(query)
-        
-        return queries
+            for batch in _batches(group[['source_id', 'target_id']]):
+                yield query, {'rows': batch}
     
     def _get_node_type(self, entity_id: str) -> str:
         """Determine node type from entity ID"""
-        if entity_id.startswith('COMP_'):
-            return 'Company'
-        elif entity_id.startswith('DIR_'):
-            return 'Director'
-        elif entity_id.startswith('TEND_'):
-            return 'Tender'
-        elif entity_id.startswith('DEPT_'):
-            return 'Department'
-        return 'Unknown'
+        prefix, separator, _ = entity_id.partition('_')
+        return NODE_TYPE_BY_PREFIX.get(prefix, 'Unknown') if separator else 'Unknown'
+    
+    def _get_node_types(self, entity_ids: pd.Series) -> pd.Series:
+        """Node type for a whole column of entity IDs in one pass"""
+        parts = entity_ids.astype(str).str.partition('_')
+        node_types = parts[0].map(NODE_TYPE_BY_PREFIX).where(parts[1] == '_')
+        return node_types.fillna('Unknown')
     
-    def save_cypher_script(self, queries: List[str], output_file: str = 'load_graph.cypher'):
-        """Save Cypher queries to file"""
+    def save_cypher_script(self, queries: Iterable[Tuple[str, Dict[str, Any]]], output_file: str = 'load_graph.cypher'):
+        """Save Cypher queries to a cypher-shell script as they are generated"""
         output_path = os.path.join(os.path.dirname(__file__), output_file)
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            for query in queries:
-                f.write(query.strip() + ';\n\n')
+        with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            total = self.write_cypher_script(queries, f)
         
         print(f"Cypher script saved to: {output_path}")
-        print(f"Total queries: {len(queries)}")
+        print(f"Total queries: {total}")
+    
+    def write_cypher_script(self, queries: Iterable[Tuple[str, Dict[str, Any]]], sink: TextIO) -> int:
+        """Stream queries to any text sink (file, cypher-shell stdin), with :param lines for batched rows"""
+        total = 0
+        for query, params in queries:
+            for name, value in params.items():
+                sink.write(f":param {name} => {_cypher_literal(value)};\n")
+            sink.write(query.strip() + ';\n\n')
+            total += 1
+        return total
+
+def _batches(frame: pd.DataFrame, size: int = BATCH_SIZE) -> Iterator[List[Dict[str, Any]]]:
+    """Parameter rows in UNWIND-sized chunks, converting one chunk at a time"""
+    for start in range(0, len(frame), size):
+        yield frame.iloc[start:start + size].to_dict('records')
+
+def _cypher_literal(value: Any) -> str:
+    """Render a parameter value as a Cypher literal for cypher-shell's :param"""
+    if isinstance(value, dict):
+        return "{" + ", ".join(f"`{key}`: {_cypher_literal(item)}" for key, item in value.items()) + "}"
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(_cypher_literal(item) for item in value) + "]"
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    # JSON string escapes are valid Cypher string escapes
+    return json.dumps(str(value))
 
 if __name__ == "__main__":
     loader = GraphDatabaseLoader()
@@ -3,7 +3,7 @@ NetraAI Data Models
 Pydantic models for API requests/responses
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Dict, Any
 from enum import Enum
 
@@ -18,12 +18,16 @@ class EntityType(str, Enum):
     TENDER = "Tender"
     DEPARTMENT = "Department"
 
-class RiskIndicator(BaseModel):
+class FrozenModel(BaseModel):
+    """Immutable response model - built once per response, never mutated afterwards"""
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
+class RiskIndicator(FrozenModel):
     indicator: str
     severity: str
     description: str
 
-class CompanyProfile(BaseModel):
+class CompanyProfile(FrozenModel):
     company_id: str
     name: str
     registration_year: int
@@ -34,7 +38,7 @@ class CompanyProfile(BaseModel):
     confidence_score: float
     fraud_label: int
     
-class DirectorProfile(BaseModel):
+class DirectorProfile(FrozenModel):
     director_id: str
     name: str
     age: int
@@ -43,7 +47,7 @@ class DirectorProfile(BaseModel):
     fraud_label: int
     company_count: int
 
-class TenderProfile(BaseModel):
+class TenderProfile(FrozenModel):
     tender_id: str
     department_id: str
     contract_value: float
@@ -53,23 +57,23 @@ class TenderProfile(BaseModel):
     risk_category: RiskCategory
     fraud_label: int
 
-class NetworkNode(BaseModel):
+class NetworkNode(FrozenModel):
     id: str
     label: str
     type: EntityType
     risk_score: float
     risk_category: RiskCategory
 
-class NetworkEdge(BaseModel):
+class NetworkEdge(FrozenModel):
     source: str
     target: str
     relationship_type: str
 
-class NetworkGraph(BaseModel):
+class NetworkGraph(FrozenModel):
     nodes: List[NetworkNode]
     edges: List[NetworkEdge]
 
-class EntityDetail(BaseModel):
+class EntityDetail(FrozenModel):
     entity_id: str
     entity_type: EntityType
     risk_score: float
@@ -78,7 +82,7 @@ class EntityDetail(BaseModel):
     connected_entities: List[Dict[str, Any]]
     tender_history: Optional[List[Dict[str, Any]]] = None
 
-class DashboardStats(BaseModel):
+class DashboardStats(FrozenModel):
     total_entities: int
     high_risk_count: int
     fraud_cluster_count: int
@@ -86,7 +90,7 @@ class DashboardStats(BaseModel):
     total_contract_value: float
     risk_distribution: Dict[str, int]
 
-class InvestigationSummary(BaseModel):
+class InvestigationSummary(FrozenModel):
     entity_id: str
     entity_type: EntityType
     risk_score: float
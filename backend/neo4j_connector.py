@@ -3,11 +3,139 @@ NetraAI Neo4j Database Connector
 Real-time connection to Neo4j graph database
 """
 
-from neo4j import GraphDatabase
+from neo4j import GraphDatabase, AsyncGraphDatabase, READ_ACCESS, Record
+from neo4j.exceptions import ClientError
 import pandas as pd
-import os
-from typing import Dict, List, Optional
+import asyncio
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from config import config
+from data_loader import load_dataset
+
+# Lookups shared by the sync and async drivers
+COMPANY_QUERY = """
+    MATCH (c:Company {company_id: $company_id})
+    RETURN c
+"""
+
+COMPANY_RELATIONSHIPS_QUERY = """
+    MATCH (c:Company {company_id: $company_id})-[r]-(other)
+    RETURN type(r) as relationship_type, 
+           labels(other)[0] as other_type,
+           properties(other) as other_properties
+    LIMIT 50
+"""
+
+# Company nodes only change on a reload, so lookups are kept briefly per connector
+COMPANY_CACHE_SIZE = 4096
+COMPANY_CACHE_TTL = 60
+
+# get_statistics, one query per figure so each runs independently
+STATISTICS_QUERIES = (
+    "MATCH (c:Company) RETURN count(c) as total_companies",
+    "MATCH (c:Company {fraud_label: 1}) RETURN count(c) as fraud_companies",
+    "MATCH (d:Director) RETURN count(d) as total_directors",
+    "MATCH (t:Tender) RETURN count(t) as total_tenders, sum(t.contract_value) as total_value",
+    "MATCH ()-[r]->() RETURN count(r) as total_relationships",
+)
+
+# Deepest variable-length expansion get_network_subgraph will run
+MAX_SUBGRAPH_DEPTH = 5
+
+# Filled in once per (source type, target type, relationship type); every batch reuses the text
+RELATIONSHIP_INSERT = """
+    UNWIND $rows AS row
+    MATCH (s:{source_type} {{{source_key}: row.source}})
+    MATCH (t:{target_type} {{{target_key}: row.target}})
+    CREATE (s)-[:`{rel_type}`]->(t)
+"""
+
+# Prefix for the in-memory GDS projections used for community detection; each run adds a unique suffix
+GDS_GRAPH_NAME = 'netraai_entities'
+
+# Node label by entity ID prefix (the part before the first underscore)
+NODE_TYPE_BY_PREFIX = {'COMP': 'Company', 'DIR': 'Director', 'TEND': 'Tender', 'DEPT': 'Department'}
+
+# Schema statements, shared by every load
+CONSTRAINTS = (
+    "CREATE CONSTRAINT company_id IF NOT EXISTS FOR (c:Company) REQUIRE c.company_id IS UNIQUE",
+    "CREATE CONSTRAINT director_id IF NOT EXISTS FOR (d:Director) REQUIRE d.director_id IS UNIQUE",
+    "CREATE CONSTRAINT tender_id IF NOT EXISTS FOR (t:Tender) REQUIRE t.tender_id IS UNIQUE",
+    "CREATE CONSTRAINT dept_id IF NOT EXISTS FOR (d:Department) REQUIRE d.department_id IS UNIQUE",
+)
+
+# Error codes meaning the schema rule is already in place
+SCHEMA_EXISTS_CODES = (
+    'Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists',
+    'Neo.ClientError.Schema.ConstraintAlreadyExists',
+)
+
+# Key property per label - must match the uniqueness constraints so relationship MATCHes are index seeks
+ID_PROPERTY_BY_LABEL = {
+    'Company': 'company_id',
+    'Director': 'director_id',
+    'Tender': 'tender_id',
+    'Department': 'department_id',
+}
+
+# Rows per UNWIND batch - one round-trip per batch instead of one per row
+LOAD_BATCH_SIZE = 10000
+
+# Batches built ahead of the writer threads, per worker - bounds memory however large the load
+LOAD_QUEUE_DEPTH = 2
+
+COMPANY_PROPERTIES = ('company_id', 'name', 'registration_year', 'industry_type', 'address', 'fraud_label')
+DIRECTOR_PROPERTIES = ('director_id', 'name', 'age', 'fraud_label')
+TENDER_PROPERTIES = ('tender_id', 'department_id', 'contract_value', 'year', 'winning_company_id', 'fraud_label')
+DEPARTMENT_PROPERTIES = ('department_id', 'name', 'location')
+
+COMPANY_INSERT = """
+    UNWIND $rows AS row
+    CREATE (c:Company {
+        company_id: row.company_id,
+        name: row.name,
+        registration_year: row.registration_year,
+        industry_type: row.industry_type,
+        address: row.address,
+        fraud_label: row.fraud_label
+    })
+"""
+
+DIRECTOR_INSERT = """
+    UNWIND $rows AS row
+    CREATE (d:Director {
+        director_id: row.director_id,
+        name: row.name,
+        age: row.age,
+        fraud_label: row.fraud_label
+    })
+"""
+
+TENDER_INSERT = """
+    UNWIND $rows AS row
+    CREATE (t:Tender {
+        tender_id: row.tender_id,
+        department_id: row.department_id,
+        contract_value: row.contract_value,
+        year: row.year,
+        winning_company_id: row.winning_company_id,
+        fraud_label: row.fraud_label
+    })
+"""
+
+DEPARTMENT_INSERT = """
+    UNWIND $rows AS row
+    CREATE (d:Department {
+        department_id: row.department_id,
+        name: row.name,
+        location: row.location
+    })
+"""
 
 class Neo4jConnector:
     """Neo4j database connector for NetraAI"""
@@ -18,18 +146,35 @@ class Neo4jConnector:
         self.user = user or config.NEO4J_USER
         self.password = password or config.NEO4J_PASSWORD
         self.driver = None
+        self.async_driver = None
+        self._company_cache: "OrderedDict[str, Tuple[float, Optional[Dict]]]" = OrderedDict()
+        self._company_cache_lock = threading.Lock()
         
     def connect(self):
         """Establish connection to Neo4j"""
+        # Fail fast rather than silently dropping to CSV mode on a misconfigured deploy;
+        # checked here so the CSV-only API never needs the secret
+        if config.ENVIRONMENT == "production" and not self.password:
+            raise RuntimeError("NEO4J_PASSWORD must be set in production")
+        
         try:
-            self.driver = GraphDatabase.driver(self.uri, auth=(self.user, self.password))
+            self.driver = GraphDatabase.driver(self.uri, auth=(self.user, self.password),
+                                               max_connection_pool_size=config.NEO4J_MAX_POOL_SIZE)
             # Test connection
             with self.driver.session() as session:
                 result = session.run("RETURN 1 as test")
                 result.single()
             print(f"✓ Connected to Neo4j at {self.uri}")
+            
+            # Async driver for request handlers, so queries do not block the event loop
+            self.async_driver = AsyncGraphDatabase.driver(self.uri, auth=(self.user, self.password),
+                                                          max_connection_pool_size=config.NEO4J_MAX_POOL_SIZE)
             return True
         except Exception as e:
+            # Leave no half-open driver behind, so callers fall back to CSV mode
+            if self.driver:
+                self.driver.close()
+                self.driver = None
             print(f"✗ Failed to connect to Neo4j: {e}")
             print(f"  URI: {self.uri}")
             print(f"  Make sure Neo4j is running and credentials are correct")
@@ -41,254 +186,377 @@ class Neo4jConnector:
             self.driver.close()
             print("✓ Neo4j connection closed")
     
+    async def close_async(self):
+        """Close the async driver"""
+        if self.async_driver:
+            await self.async_driver.close()
+            self.async_driver = None
+    
+    def warm_up_pool(self, size: int = config.NEO4J_POOL_WARMUP):
+        """Open `size` pooled connections now so first requests skip the TCP/TLS handshake"""
+        sessions = [self.driver.session() for _ in range(size)]
+        try:
+            # Each unconsumed result holds its own connection, forcing distinct ones
+            results = [session.run("RETURN 1") for session in sessions]
+            for result in results:
+                result.consume()
+        finally:
+            for session in sessions:
+                session.close()
+    
+    async def warm_up_pool_async(self, size: int = config.NEO4J_POOL_WARMUP):
+        """Open `size` connections in the async driver's pool"""
+        async def ping():
+            async with self.async_driver.session() as session:
+                result = await session.run("RETURN 1")
+                await result.consume()
+        
+        await asyncio.gather(*(ping() for _ in range(size)))
+    
     def clear_database(self):
         """Clear all nodes and relationships"""
         with self.driver.session() as session:
             session.run("MATCH (n) DETACH DELETE n")
             print("✓ Database cleared")
+        self.clear_company_cache()
     
     def create_constraints(self):
         """Create uniqueness constraints"""
-        constraints = [
-            "CREATE CONSTRAINT company_id IF NOT EXISTS FOR (c:Company) REQUIRE c.company_id IS UNIQUE",
-            "CREATE CONSTRAINT director_id IF NOT EXISTS FOR (d:Director) REQUIRE d.director_id IS UNIQUE",
-            "CREATE CONSTRAINT tender_id IF NOT EXISTS FOR (t:Tender) REQUIRE t.tender_id IS UNIQUE",
-            "CREATE CONSTRAINT dept_id IF NOT EXISTS FOR (d:Department) REQUIRE d.department_id IS UNIQUE"
-        ]
-        
+        ok = True
         with self.driver.session() as session:
-            for constraint in constraints:
+            for constraint in CONSTRAINTS:
                 try:
-                    session.run(constraint)
-                except Exception as e:
-                    # Constraint might already exist
-                    pass
-        print("✓ Constraints created")
+                    session.run(constraint).consume()
+                except ClientError as e:
+                    if e.code in SCHEMA_EXISTS_CODES:
+                        continue
+                    print(f"⚠️  Constraint failed ({e.code}): {e.message}")
+                    ok = False
+        if ok:
+            print("✓ Constraints created")
+        else:
+            print("⚠️  Some uniqueness constraints are missing")
+    
+    def check_indexes(self):
+        """Confirm company lookups use the index backing the ID uniqueness constraint"""
+        with self.driver.session() as session:
+            # EXPLAIN plans without executing - the ID lookup should start with an index seek
+            summary = session.run(
+                "EXPLAIN MATCH (c:Company {company_id: $company_id}) RETURN c", company_id=""
+            ).consume()
+            operators = self._plan_operators(summary.plan) if summary.plan else []
+        
+        if any('IndexSeek' in op for op in operators):
+            print("✓ Indexes ready (company lookups use an index seek)")
+        else:
+            print(f"⚠️  Company lookups are not using an index: {' -> '.join(operators)}")
+            print("  Run neo4j_connector.py to load the data and create the ID constraints")
+    
+    def _plan_operators(self, plan: Dict) -> List[str]:
+        """Flatten a query plan into its operator names"""
+        operators = [plan.get('operatorType', '')]
+        for child in plan.get('children', []):
+            operators.extend(self._plan_operators(child))
+        return operators
     
     def load_companies(self, companies_df: pd.DataFrame):
         """Load company nodes into Neo4j"""
-        with self.driver.session() as session:
-            for _, row in companies_df.iterrows():
-                query = """
-                CREATE (c:Company {
-                    company_id: $company_id,
-                    name: $name,
-                    registration_year: $registration_year,
-                    industry_type: $industry_type,
-                    address: $address,
-                    fraud_label: $fraud_label
-                })
-                """
-                session.run(query, 
-                    company_id=row['company_id'],
-                    name=row['name'],
-                    registration_year=int(row['registration_year']),
-                    industry_type=row['industry_type'],
-                    address=row['address'],
-                    fraud_label=int(row['fraud_label'])
-                )
+        self.run_batches(self.company_batches(companies_df))
         print(f"✓ Loaded {len(companies_df)} companies")
     
     def load_directors(self, directors_df: pd.DataFrame):
         """Load director nodes into Neo4j"""
-        with self.driver.session() as session:
-            for _, row in directors_df.iterrows():
-                query = """
-                CREATE (d:Director {
-                    director_id: $director_id,
-                    name: $name,
-                    age: $age,
-                    fraud_label: $fraud_label
-                })
-                """
-                session.run(query,
-                    director_id=row['director_id'],
-                    name=row['name'],
-                    age=int(row['age']),
-                    fraud_label=int(row['fraud_label'])
-                )
+        self.run_batches(self.director_batches(directors_df))
         print(f"✓ Loaded {len(directors_df)} directors")
     
     def load_tenders(self, tenders_df: pd.DataFrame):
         """Load tender nodes into Neo4j"""
-        with self.driver.session() as session:
-            for _, row in tenders_df.iterrows():
-                query = """
-                CREATE (t:Tender {
-                    tender_id: $tender_id,
-                    department_id: $department_id,
-                    contract_value: $contract_value,
-                    year: $year,
-                    winning_company_id: $winning_company_id,
-                    fraud_label: $fraud_label
-                })
-                """
-                session.run(query,
-                    tender_id=row['tender_id'],
-                    department_id=row['department_id'],
-                    contract_value=float(row['contract_value']),
-                    year=int(row['year']),
-                    winning_company_id=row['winning_company_id'],
-                    fraud_label=int(row['fraud_label'])
-                )
+        self.run_batches(self.tender_batches(tenders_df))
         print(f"✓ Loaded {len(tenders_df)} tenders")
     
     def load_departments(self, departments_df: pd.DataFrame):
         """Load department nodes into Neo4j"""
-        with self.driver.session() as session:
-            for _, row in departments_df.iterrows():
-                query = """
-                CREATE (d:Department {
-                    department_id: $department_id,
-                    name: $name,
-                    location: $location
-                })
-                """
-                session.run(query,
-                    department_id=row['department_id'],
-                    name=row['name'],
-                    location=row['location']
-                )
+        self.run_batches(self.department_batches(departments_df))
         print(f"✓ Loaded {len(departments_df)} departments")
     
+    def company_batches(self, companies_df: pd.DataFrame) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """UNWIND jobs creating company nodes"""
+        rows = companies_df.astype({'registration_year': int, 'fraud_label': int})
+        return self._batch_jobs(COMPANY_INSERT, rows[list(COMPANY_PROPERTIES)])
+    
+    def director_batches(self, directors_df: pd.DataFrame) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """UNWIND jobs creating director nodes"""
+        rows = directors_df.astype({'age': int, 'fraud_label': int})
+        return self._batch_jobs(DIRECTOR_INSERT, rows[list(DIRECTOR_PROPERTIES)])
+    
+    def tender_batches(self, tenders_df: pd.DataFrame) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """UNWIND jobs creating tender nodes"""
+        rows = tenders_df.astype({'contract_value': float, 'year': int, 'fraud_label': int})
+        return self._batch_jobs(TENDER_INSERT, rows[list(TENDER_PROPERTIES)])
+    
+    def department_batches(self, departments_df: pd.DataFrame) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """UNWIND jobs creating department nodes"""
+        return self._batch_jobs(DEPARTMENT_INSERT, departments_df[list(DEPARTMENT_PROPERTIES)])
+    
+    def _batch_jobs(self, query: str, frame: pd.DataFrame, size: int = LOAD_BATCH_SIZE) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """(query, parameters) jobs covering `frame` in chunks of `size` rows, built lazily"""
+        for start in range(0, len(frame), size):
+            yield query, {'rows': frame.iloc[start:start + size].to_dict('records')}
+    
+    def run_batches(self, jobs: Iterable[Tuple[str, Dict[str, Any]]],
+                    max_workers: int = config.NEO4J_LOAD_WORKERS):
+        """Run (query, parameters) write jobs across `max_workers` sessions, pulling jobs as slots free up"""
+        def run(query: str, params: Dict[str, Any]):
+            # Sessions are not thread-safe - each job borrows its own pooled connection.
+            # Managed transactions retry lock conflicts (deadlocks) between concurrent batches
+            with self.driver.session() as session:
+                session.execute_write(lambda tx: tx.run(query, params).consume())
+        
+        # At most LOAD_QUEUE_DEPTH batches per worker exist at once; the generator waits for a free slot
+        max_workers = max(max_workers, 1)
+        slots = threading.BoundedSemaphore(max_workers * LOAD_QUEUE_DEPTH)
+        errors = []
+        
+        def done(future):
+            if future.exception() is not None:
+                errors.append(future.exception())
+            slots.release()
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for query, params in jobs:
+                slots.acquire()
+                if errors:
+                    # Stop feeding after the first failure; running batches finish on exit
+                    slots.release()
+                    break
+                executor.submit(run, query, params).add_done_callback(done)
+        
+        if errors:
+            raise errors[0]
+    
+    def _relationship_jobs(self, relationships: pd.DataFrame) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """UNWIND jobs creating relationships, one query text per (source type, target type, relationship type)"""
+        # Grouping keeps the plan reused across every batch of a group
+        groups = relationships.groupby(['source_type', 'target_type', 'relationship_type'], observed=True, sort=False)
+        for (source_type, target_type, rel_type), group in groups:
+            query = RELATIONSHIP_INSERT.format(
+                source_type=source_type, source_key=ID_PROPERTY_BY_LABEL[source_type],
+                target_type=target_type, target_key=ID_PROPERTY_BY_LABEL[target_type], rel_type=rel_type
+            )
+            rows = group[['source_id', 'target_id']].rename(columns={'source_id': 'source', 'target_id': 'target'})
+            yield from self._batch_jobs(query, rows)
+    
     def load_relationships(self, relationships_df: pd.DataFrame):
         """Load relationships into Neo4j"""
-        with self.driver.session() as session:
-            for _, row in relationships_df.iterrows():
-                rel_type = row['relationship_type']
-                source = row['source_id']
-                target = row['target_id']
-                
-                # Determine node types
-                source_type = self._get_node_type(source)
-                target_type = self._get_node_type(target)
-                
-                query = f"""
-                MATCH (s:{source_type} {{{source_type.lower()}_id: $source}})
-                MATCH (t:{target_type} {{{target_type.lower()}_id: $target}})
-                CREATE (s)-[:{rel_type}]->(t)
-                """
-                session.run(query, source=source, target=target)
-        print(f"✓ Loaded {len(relationships_df)} relationships")
+        relationships = relationships_df.assign(
+            source_type=self._get_node_types(relationships_df['source_id']),
+            target_type=self._get_node_types(relationships_df['target_id'])
+        )
+        
+        # No node can match an unknown ID prefix - skip those rows rather than run unindexed scans
+        known = (relationships['source_type'].isin(ID_PROPERTY_BY_LABEL.keys())
+                 & relationships['target_type'].isin(ID_PROPERTY_BY_LABEL.keys()))
+        skipped = int((~known).sum())
+        
+        self.run_batches(self._relationship_jobs(relationships[known]))
+        print(f"✓ Loaded {len(relationships_df) - skipped} relationships")
+        if skipped:
+            print(f"⚠️  Skipped {skipped} relationships with unrecognised entity IDs")
+    
+    def _get_node_types(self, entity_ids: pd.Series) -> pd.Series:
+        """Node type for a whole column of entity IDs in one pass"""
+        parts = entity_ids.astype(str).str.partition('_')
+        node_types = parts[0].map(NODE_TYPE_BY_PREFIX).where(parts[1] == '_')
+        return node_types.fillna('Unknown')
     
     def _get_node_type(self, entity_id: str) -> str:
         """Determine node type from entity ID"""
-        if entity_id.startswith('COMP_'):
-            return 'Company'
-        elif entity_id.startswith('DIR_'):
-            return 'Director'
-        elif entity_id.startswith('TEND_'):
-            return 'Tender'
-        elif entity_id.startswith('DEPT_'):
-            return 'Department'
-        return 'Unknown'
+        prefix, separator, _ = entity_id.partition('_')
+        return NODE_TYPE_BY_PREFIX.get(prefix, 'Unknown') if separator else 'Unknown'
+    
+    def _read(self, query: str, **parameters) -> List[Record]:
+        """Run a read-only query in a managed read transaction (retried, routable to followers)"""
+        with self.driver.session(default_access_mode=READ_ACCESS) as session:
+            return session.execute_read(lambda tx: list(tx.run(query, parameters)))
+    
+    async def _read_async(self, query: str, **parameters) -> List[Record]:
+        """Async counterpart of _read"""
+        async def work(tx):
+            result = await tx.run(query, parameters)
+            return [record async for record in result]
+        
+        async with self.async_driver.session(default_access_mode=READ_ACCESS) as session:
+            return await session.execute_read(work)
     
     def get_company(self, company_id: str) -> Optional[Dict]:
         """Get company by ID"""
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (c:Company {company_id: $company_id})
-                RETURN c
-            """, company_id=company_id)
-            record = result.single()
-            return dict(record['c']) if record else None
+        hit, company = self._cached_company(company_id)
+        if not hit:
+            records = self._read(COMPANY_QUERY, company_id=company_id)
+            company = self._cache_company(company_id, dict(records[0]['c']) if records else None)
+        return dict(company) if company else None
+    
+    async def get_company_async(self, company_id: str) -> Optional[Dict]:
+        """Get company by ID without blocking the event loop"""
+        hit, company = self._cached_company(company_id)
+        if not hit:
+            records = await self._read_async(COMPANY_QUERY, company_id=company_id)
+            company = self._cache_company(company_id, dict(records[0]['c']) if records else None)
+        return dict(company) if company else None
+    
+    def _cached_company(self, company_id: str) -> Tuple[bool, Optional[Dict]]:
+        """(hit, company) from the lookup cache; unknown IDs are cached as None too"""
+        with self._company_cache_lock:
+            entry = self._company_cache.get(company_id)
+            if entry is None or entry[0] <= time.monotonic():
+                return False, None
+            self._company_cache.move_to_end(company_id)
+            return True, entry[1]
+    
+    def _cache_company(self, company_id: str, company: Optional[Dict]) -> Optional[Dict]:
+        """Store a lookup result, evicting the least recently used entry when full"""
+        with self._company_cache_lock:
+            self._company_cache[company_id] = (time.monotonic() + COMPANY_CACHE_TTL, company)
+            self._company_cache.move_to_end(company_id)
+            if len(self._company_cache) > COMPANY_CACHE_SIZE:
+                self._company_cache.popitem(last=False)
+        return company
+    
+    def clear_company_cache(self):
+        """Forget cached company lookups, e.g. after a reload"""
+        with self._company_cache_lock:
+            self._company_cache.clear()
     
     def get_company_relationships(self, company_id: str) -> List[Dict]:
         """Get all relationships for a company"""
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (c:Company {company_id: $company_id})-[r]-(other)
-                RETURN type(r) as relationship_type, 
+        return [dict(record) for record in self._read(COMPANY_RELATIONSHIPS_QUERY, company_id=company_id)]
+    
+    async def get_company_relationships_async(self, company_id: str) -> List[Dict]:
+        """Get all relationships for a company without blocking the event loop"""
+        records = await self._read_async(COMPANY_RELATIONSHIPS_QUERY, company_id=company_id)
+        return [dict(record) for record in records]
+    
+    def get_companies_batch(self, company_ids: List[str]) -> Dict[str, List[Dict]]:
+        """Get relationships for many companies in one UNWIND query"""
+        records = self._read("""
+            UNWIND $company_ids AS company_id
+            CALL {
+                WITH company_id
+                MATCH (c:Company {company_id: company_id})-[r]-(other)
+                RETURN type(r) as relationship_type,
                        labels(other)[0] as other_type,
                        properties(other) as other_properties
                 LIMIT 50
-            """, company_id=company_id)
-            return [dict(record) for record in result]
+            }
+            RETURN company_id, relationship_type, other_type, other_properties
+        """, company_ids=company_ids)
+        
+        # Same row shape as get_company_relationships, grouped by company
+        relationships = {company_id: [] for company_id in company_ids}
+        for record in records:
+            row = dict(record)
+            relationships[row.pop('company_id')].append(row)
+        return relationships
     
     def get_high_risk_companies(self, limit: int = 20) -> List[Dict]:
         """Get companies with fraud_label = 1"""
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (c:Company {fraud_label: 1})
-                RETURN c
-                LIMIT $limit
-            """, limit=limit)
-            return [dict(record['c']) for record in result]
+        records = self._read("""
+            MATCH (c:Company {fraud_label: 1})
+            RETURN c
+            LIMIT $limit
+        """, limit=limit)
+        return [dict(record['c']) for record in records]
     
     def get_network_subgraph(self, entity_id: str, depth: int = 2) -> Dict:
         """Get network subgraph around an entity"""
-        with self.driver.session() as session:
-            # Get nodes and relationships within depth
-            result = session.run("""
-                MATCH path = (start {company_id: $entity_id})-[*1..$depth]-(connected)
-                WHERE ALL(node IN nodes(path) WHERE 'Company' IN labels(node))
-                WITH nodes(path) as nodes, relationships(path) as rels
-                UNWIND nodes as n
-                WITH collect(DISTINCT n) as unique_nodes, rels
-                UNWIND rels as r
-                RETURN unique_nodes, collect(DISTINCT r) as unique_rels
-                LIMIT 1
-            """, entity_id=entity_id, depth=depth)
-            
-            record = result.single()
-            if not record:
-                return {'nodes': [], 'edges': []}
-            
-            nodes = [dict(node) for node in record['unique_nodes']]
-            edges = []
-            for rel in record['unique_rels']:
-                edges.append({
-                    'source': rel.start_node['company_id'],
-                    'target': rel.end_node['company_id'],
-                    'type': rel.type
-                })
-            
-            return {'nodes': nodes, 'edges': edges}
+        # Variable-length bounds cannot be parameters - interpolate a clamped int instead
+        depth = max(1, min(int(depth), MAX_SUBGRAPH_DEPTH))
+        
+        # Get nodes and relationships within depth; the labelled start is an index seek.
+        # Relationships are collected across every path, and the node set is their endpoints
+        records = self._read(f"""
+            MATCH path = (start:Company {{company_id: $entity_id}})-[*1..{depth}]-(connected:Company)
+            WHERE ALL(node IN nodes(path) WHERE node:Company)
+            UNWIND relationships(path) as r
+            WITH collect(DISTINCT r) as unique_rels
+            UNWIND unique_rels as r
+            UNWIND [startNode(r), endNode(r)] as n
+            RETURN collect(DISTINCT n) as unique_nodes, unique_rels
+        """, entity_id=entity_id)
+        
+        if not records:
+            return {'nodes': [], 'edges': []}
+        
+        record = records[0]
+        nodes = [dict(node) for node in record['unique_nodes']]
+        edges = []
+        for rel in record['unique_rels']:
+            edges.append({
+                'source': rel.start_node['company_id'],
+                'target': rel.end_node['company_id'],
+                'type': rel.type
+            })
+        
+        return {'nodes': nodes, 'edges': edges}
     
     def detect_fraud_clusters(self) -> List[List[str]]:
         """Detect fraud clusters using graph algorithms"""
+        # Find connected components of fraudulent companies
+        records = self._read("""
+            MATCH (c:Company {fraud_label: 1})
+            MATCH path = (c)-[*1..3]-(other:Company {fraud_label: 1})
+            WITH c, collect(DISTINCT other.company_id) as cluster
+            WHERE size(cluster) >= 3
+            RETURN c.company_id as seed, cluster
+            LIMIT 10
+        """)
+        
+        clusters = []
+        seen = set()
+        for record in records:
+            cluster = [record['seed']] + record['cluster']
+            cluster_key = tuple(sorted(cluster))
+            if cluster_key not in seen:
+                seen.add(cluster_key)
+                clusters.append(cluster)
+        
+        return clusters
+    
+    def detect_fraud_clusters_gds(self) -> List[List[str]]:
+        """Detect fraud clusters with GDS Louvain, run inside the database over an in-memory projection"""
+        # Per-call projection, so concurrent runs never drop a graph another call is streaming
+        graph_name = f"{GDS_GRAPH_NAME}_{uuid.uuid4().hex}"
         with self.driver.session() as session:
-            # Find connected components of fraudulent companies
-            result = session.run("""
-                MATCH (c:Company {fraud_label: 1})
-                MATCH path = (c)-[*1..3]-(other:Company {fraud_label: 1})
-                WITH c, collect(DISTINCT other.company_id) as cluster
-                WHERE size(cluster) >= 3
-                RETURN c.company_id as seed, cluster
-                LIMIT 10
-            """)
-            
-            clusters = []
-            seen = set()
-            for record in result:
-                cluster = [record['seed']] + record['cluster']
-                cluster_key = tuple(sorted(cluster))
-                if cluster_key not in seen:
-                    seen.add(cluster_key)
-                    clusters.append(cluster)
-            
-            return clusters
+            # Same node set as the in-memory engine's graph, departments included via ISSUED_BY
+            session.run("""
+                CALL gds.graph.project($name, ['Company', 'Director', 'Tender', 'Department'],
+                                       {ALL: {type: '*', orientation: 'UNDIRECTED'}})
+            """, name=graph_name).consume()
+            try:
+                # Same filter as the in-memory engine: 3+ companies, over half of them fraudulent
+                result = session.run("""
+                    CALL gds.louvain.stream($name, {concurrency: 1})
+                    YIELD nodeId, communityId
+                    WITH gds.util.asNode(nodeId) AS node, communityId
+                    WHERE node:Company
+                    WITH communityId, collect(node.company_id) AS members, sum(node.fraud_label) AS fraud_count
+                    WHERE size(members) >= 3 AND toFloat(fraud_count) / size(members) > 0.5
+                    RETURN members
+                """, name=graph_name)
+                return [record['members'] for record in result]
+            finally:
+                session.run("CALL gds.graph.drop($name, false)", name=graph_name).consume()
     
     def get_statistics(self) -> Dict:
         """Get database statistics"""
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (c:Company)
-                WITH count(c) as total_companies, 
-                     sum(CASE WHEN c.fraud_label = 1 THEN 1 ELSE 0 END) as fraud_companies
-                MATCH (d:Director)
-                WITH total_companies, fraud_companies, count(d) as total_directors
-                MATCH (t:Tender)
-                WITH total_companies, fraud_companies, total_directors, 
-                     count(t) as total_tenders,
-                     sum(t.contract_value) as total_value
-                MATCH ()-[r]->()
-                RETURN total_companies, fraud_companies, total_directors, 
-                       total_tenders, total_value, count(r) as total_relationships
-            """)
-            
-            record = result.single()
-            return dict(record) if record else {}
+        # Independent count queries - label and relationship counts come from the count store
+        with ThreadPoolExecutor(max_workers=len(STATISTICS_QUERIES)) as executor:
+            records = list(executor.map(self._read, STATISTICS_QUERIES))
+        
+        stats = {}
+        for rows in records:
+            stats.update(dict(rows[0]))
+        return stats
 
 
 def load_data_to_neo4j():
@@ -311,14 +579,15 @@ def load_data_to_neo4j():
         return False
     
     try:
-        # Load CSV data
-        print("\nLoading CSV files...")
-        data_dir = config.DATA_DIR
-        companies = pd.read_csv(os.path.join(data_dir, 'companies.csv'))
-        directors = pd.read_csv(os.path.join(data_dir, 'directors.csv'))
-        tenders = pd.read_csv(os.path.join(data_dir, 'tenders.csv'))
-        departments = pd.read_csv(os.path.join(data_dir, 'departments.csv'))
-        relationships = pd.read_csv(os.path.join(data_dir, 'relationships.csv'))
+        # Load datasets - typed Parquet (or the pyarrow CSV parser), only the columns stored in Neo4j
+        print("\nLoading datasets...")
+        companies = load_dataset('companies', columns=list(COMPANY_PROPERTIES), compact=True)
+        directors = load_dataset('directors', columns=list(DIRECTOR_PROPERTIES), compact=True)
+        tenders = load_dataset('tenders', columns=list(TENDER_PROPERTIES), compact=True)
+        departments = load_dataset('departments', columns=list(DEPARTMENT_PROPERTIES), compact=True)
+        relationships = load_dataset(
+            'relationships', columns=['source_id', 'target_id', 'relationship_type'], compact=True
+        )
         
         # Clear existing data
         print("\nClearing existing data...")
@@ -328,12 +597,17 @@ def load_data_to_neo4j():
         print("\nCreating constraints...")
         connector.create_constraints()
         
-        # Load nodes
+        # Confirm ID lookups are index-backed before relationship MATCHes depend on them
+        connector.check_indexes()
+        
+        # Load nodes - batches of different labels do not contend, so they run concurrently
         print("\nLoading nodes...")
-        connector.load_companies(companies)
-        connector.load_directors(directors)
-        connector.load_tenders(tenders)
-        connector.load_departments(departments)
+        connector.run_batches(chain(
+            connector.company_batches(companies), connector.director_batches(directors),
+            connector.tender_batches(tenders), connector.department_batches(departments)
+        ))
+        print(f"✓ Loaded {len(companies)} companies, {len(directors)} directors, "
+              f"{len(tenders)} tenders and {len(departments)} departments")
         
         # Load relationships
         print("\nLoading relationships...")
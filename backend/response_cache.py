@@ -0,0 +1,47 @@
+"""
+NetraAI Response Cache
+In-process TTL cache for read-mostly endpoint results
+"""
+
+import functools
+import time
+from collections import OrderedDict
+from typing import Callable, List
+
+# Every decorated endpoint's store, so a data reload can drop them all at once
+_caches: List[OrderedDict] = []
+
+def ttl_cache(expire: float, maxsize: int = 1024) -> Callable:
+    """Cache an async endpoint's result per argument set for `expire` seconds"""
+    def decorator(func: Callable) -> Callable:
+        # argument key -> (expiry time, result)
+        store: OrderedDict = OrderedDict()
+        _caches.append(store)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+
+            hit = store.get(key)
+            if hit is not None and hit[0] > now:
+                store.move_to_end(key)
+                return hit[1]
+
+            result = await func(*args, **kwargs)
+            store[key] = (now + expire, result)
+            store.move_to_end(key)
+            if len(store) > maxsize:
+                store.popitem(last=False)
+            return result
+
+        wrapper.cache_clear = store.clear
+        return wrapper
+    return decorator
+
+def clear_all() -> int:
+    """Drop every cached response; returns how many entries were removed"""
+    removed = sum(len(store) for store in _caches)
+    for store in _caches:
+        store.clear()
+    return removed
@@ -8,7 +8,17 @@ import numpy as np
 import networkx as nx
 from typing import Dict, List, Tuple
 from models import RiskCategory, RiskIndicator
+from config import config
+from risk_kernels import score_companies, SHARED_DIRECTORS, WIN_PATTERN, CENTRALITY, SHELL
 import community as community_louvain
+import random
+
+# igraph's C Louvain when installed, python-louvain over the NetworkX graph otherwise
+try:
+    import igraph as ig
+    IGRAPH_AVAILABLE = True
+except ImportError:
+    IGRAPH_AVAILABLE = False
 
 class RiskScoringEngine:
     def __init__(self, data: Dict[str, pd.DataFrame]):
@@ -17,178 +27,142 @@ class RiskScoringEngine:
         self.tenders = data['tenders']
         self.relationships = data['relationships']
         self.graph = self._build_networkx_graph()
+        self._build_indexes()
         
     def _build_networkx_graph(self) -> nx.Graph:
         """Build NetworkX graph from relationships"""
+        # Topology only - node attributes stay in the DataFrames, which scoring reads directly
         G = nx.Graph()
         
         # Add nodes
-        for _, row in self.companies.iterrows():
-            G.add_node(row['company_id'], type='company', **row.to_dict())
-        
-        for _, row in self.directors.iterrows():
-            G.add_node(row['director_id'], type='director', **row.to_dict())
-        
-        for _, row in self.tenders.iterrows():
-            G.add_node(row['tender_id'], type='tender', **row.to_dict())
+        G.add_nodes_from(self.companies['company_id'])
+        G.add_nodes_from(self.directors['director_id'])
+        G.add_nodes_from(self.tenders['tender_id'])
         
         # Add edges
-        for _, row in self.relationships.iterrows():
-            G.add_edge(row['source_id'], row['target_id'], 
-                      relationship_type=row['relationship_type'])
+        G.add_edges_from(zip(self.relationships['source_id'], self.relationships['target_id']))
         
         return G
     
+    def _build_indexes(self):
+        """Director lookups built once, so scoring never rescans the relationship table"""
+        director_of = self.relationships.loc[
+            self.relationships['relationship_type'] == 'DIRECTOR_OF', ['source_id', 'target_id']
+        ].drop_duplicates()
+        
+        # Self-join on director: every (company, other company) pair sharing at least one director
+        pairs = director_of.merge(director_of, on='source_id')
+        pairs = pairs[pairs['target_id_x'] != pairs['target_id_y']]
+        self._shared_director_counts = pairs.groupby('target_id_x')['target_id_y'].nunique().to_dict()
+        
+        # Companies per address and per registration year, for the shell company check
+        self._address_counts = self.companies['address'].value_counts().to_dict()
+        self._year_counts = self.companies['registration_year'].value_counts().to_dict()
+        
+        # Shell score: other companies at the same address (up to 1.0) plus the same registration year (up to 0.5)
+        same_address = self.companies['address'].map(self._address_counts).astype(float).fillna(1.0) - 1
+        same_year = self.companies['registration_year'].map(self._year_counts).astype(float).fillna(1.0) - 1
+        self._shell_scores = pd.Series(
+            np.minimum(same_address.to_numpy() / 5.0, 1.0) + np.minimum(same_year.to_numpy() / 10.0, 0.5),
+            index=self.companies['company_id']
+        )
+        
+        # The graph never changes after construction, so node degrees are read once
+        self._degree = dict(self.graph.degree())
+        self._max_degree = max(self._degree.values(), default=1)
+        
+        # Won tenders per company; the win count includes repeats, values come from distinct tender ids.
+        # Sorted by company so each company's values are one contiguous span
+        won = self.relationships.loc[self.relationships['relationship_type'] == 'WON', ['source_id', 'target_id']]
+        self._won_counts = won['source_id'].value_counts()
+        won_values = won.drop_duplicates().merge(
+            self.tenders[['tender_id', 'contract_value']], left_on='target_id', right_on='tender_id'
+        ).sort_values('source_id', kind='stable')
+        self._won_values = won_values['contract_value'].to_numpy(dtype=np.float64)
+        won_companies, won_starts, won_sizes = np.unique(
+            won_values['source_id'].to_numpy(dtype=object), return_index=True, return_counts=True
+        )
+        self._won_spans = pd.DataFrame({'start': won_starts, 'size': won_sizes}, index=won_companies)
+        self._overall_mean = float(self.tenders['contract_value'].mean())
+        
+        # Every kernel input as an array in company row order, so scoring a batch is one gather
+        company_index = pd.Index(self.companies['company_id'])
+        self._company_pos = dict(zip(company_index, range(len(company_index))))
+        shared_counts = company_index.map(self._shared_director_counts).to_series().fillna(0)
+        self._shared_by_pos = np.minimum(shared_counts.to_numpy(dtype=np.float64) / 10.0, 1.0)
+        self._shell_by_pos = self._shell_scores.to_numpy(dtype=np.float64)
+        self._degree_by_pos = np.fromiter(
+            (self._degree.get(cid, -1) for cid in company_index), dtype=np.float64, count=len(company_index)
+        )
+        self._won_count_by_pos = self._won_counts.reindex(company_index, fill_value=0).to_numpy(dtype=np.float64)
+        spans = self._won_spans.reindex(company_index, fill_value=0)
+        self._won_start_by_pos = spans['start'].to_numpy(dtype=np.int64)
+        self._won_size_by_pos = spans['size'].to_numpy(dtype=np.int64)
+    
+    def calculate_risk_scores_bulk(self, company_ids: List[str]) -> List[Tuple[float, float, List[RiskIndicator]]]:
+        """Calculate risk scores for many companies in one compiled kernel pass"""
+        factors, risk, confidence = self._score_arrays(company_ids)
+        return [
+            (float(risk[i]), float(confidence[i]), self._build_indicators(*factors[i].tolist()))
+            for i in range(len(company_ids))
+        ]
+    
+    def _score_arrays(self, company_ids: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Gather per-company inputs as arrays and run the risk kernel over them"""
+        n = len(company_ids)
+        # Unknown IDs raise KeyError, as a missing company has no profile to score
+        pos = np.fromiter((self._company_pos[cid] for cid in company_ids), dtype=np.intp, count=n)
+        shared = self._shared_by_pos[pos]
+        shell = self._shell_by_pos[pos]
+        degrees = self._degree_by_pos[pos]
+        
+        # Won-tender join is prebuilt; only the per-request spans are gathered here
+        won_counts = self._won_count_by_pos[pos]
+        sizes = self._won_size_by_pos[pos]
+        won_indptr = np.zeros(n + 1, dtype=np.int64)
+        won_indptr[1:] = np.cumsum(sizes)
+        offsets = np.repeat(self._won_start_by_pos[pos] - won_indptr[:-1], sizes)
+        won_values = self._won_values[offsets + np.arange(won_indptr[-1])]
+        
+        return score_companies(
+            shared, won_counts, won_indptr, won_values,
+            len(self.tenders), self._overall_mean,
+            degrees, float(self._max_degree), shell
+        )
+    
     def calculate_company_risk_score(self, company_id: str) -> Tuple[float, float, List[RiskIndicator]]:
-        """Calculate risk score for a company"""
+        """Calculate risk score for a company, through the same kernel as the bulk path"""
+        return self.calculate_risk_scores_bulk([company_id])[0]
+    
+    def _build_indicators(self, shared_director_score: float, win_pattern_score: float,
+                          centrality_score: float, shell_score: float) -> List[RiskIndicator]:
+        """Risk indicators for the factor scores that cross their thresholds"""
         indicators = []
-        risk_factors = []
-        
-        company = self.companies[self.companies['company_id'] == company_id].iloc[0]
-        
-        # Factor 1: Shared directors with competing companies
-        shared_director_score = self._check_shared_directors(company_id)
         if shared_director_score > 0.3:
             indicators.append(RiskIndicator(
                 indicator="Shared Directors",
                 severity="High" if shared_director_score > 0.6 else "Medium",
                 description=f"Shares directors with {int(shared_director_score * 10)} competing bidders"
             ))
-        risk_factors.append(shared_director_score * 0.25)
-        
-        # Factor 2: Tender win patterns
-        win_pattern_score = self._check_tender_patterns(company_id)
         if win_pattern_score > 0.4:
             indicators.append(RiskIndicator(
                 indicator="Suspicious Win Pattern",
                 severity="High" if win_pattern_score > 0.7 else "Medium",
                 description="Consecutive high-value tender wins above network mean"
             ))
-        risk_factors.append(win_pattern_score * 0.30)
-        
-        # Factor 3: Network centrality
-        centrality_score = self._calculate_centrality(company_id)
         if centrality_score > 0.5:
             indicators.append(RiskIndicator(
                 indicator="High Network Centrality",
                 severity="Medium",
                 description="Dense cluster centrality indicating potential collusion"
             ))
-        risk_factors.append(centrality_score * 0.20)
-        
-        # Factor 4: Shell company indicators
-        shell_score = self._check_shell_indicators(company_id)
         if shell_score > 0.5:
             indicators.append(RiskIndicator(
                 indicator="Shell Company Indicators",
                 severity="High",
                 description="Shared address and registration year with multiple entities"
             ))
-        risk_factors.append(shell_score * 0.25)
-        
-        # Calculate final risk score
-        risk_score = min(sum(risk_factors), 1.0)
-        
-        # Confidence score based on data availability
-        confidence = self._calculate_confidence(company_id)
-        
-        return risk_score, confidence, indicators
-    
-    def _check_shared_directors(self, company_id: str) -> float:
-        """Check for shared directors across competing companies"""
-        # Get directors of this company
-        director_rels = self.relationships[
-            (self.relationships['target_id'] == company_id) &
-            (self.relationships['relationship_type'] == 'DIRECTOR_OF')
-        ]
-        
-        if len(director_rels) == 0:
-            return 0.0
-        
-        director_ids = director_rels['source_id'].tolist()
-        
-        # Count companies sharing these directors
-        shared_companies = set()
-        for director_id in director_ids:
-            other_companies = self.relationships[
-                (self.relationships['source_id'] == director_id) &
-                (self.relationships['relationship_type'] == 'DIRECTOR_OF') &
-                (self.relationships['target_id'] != company_id)
-            ]['target_id'].tolist()
-            shared_companies.update(other_companies)
-        
-        # Normalize score
-        return min(len(shared_companies) / 10.0, 1.0)
-    
-    def _check_tender_patterns(self, company_id: str) -> float:
-        """Analyze tender winning patterns"""
-        won_tenders = self.relationships[
-            (self.relationships['source_id'] == company_id) &
-            (self.relationships['relationship_type'] == 'WON')
-        ]
-        
-        if len(won_tenders) == 0:
-            return 0.0
-        
-        tender_ids = won_tenders['target_id'].tolist()
-        tender_values = self.tenders[self.tenders['tender_id'].isin(tender_ids)]['contract_value']
-        
-        if len(tender_values) == 0:
-            return 0.0
-        
-        # Check if average value is significantly above mean
-        avg_value = tender_values.mean()
-        overall_mean = self.tenders['contract_value'].mean()
-        
-        value_ratio = avg_value / overall_mean if overall_mean > 0 else 1.0
-        
-        # Check win frequency
-        win_frequency = len(won_tenders) / len(self.tenders)
-        
-        return min((value_ratio - 1.0) * 0.5 + win_frequency * 2.0, 1.0)
-    
-    def _calculate_centrality(self, entity_id: str) -> float:
-        """Calculate network centrality score"""
-        if entity_id not in self.graph:
-            return 0.0
-        
-        try:
-            # Simplified centrality - just use degree
-            degree = self.graph.degree(entity_id)
-            max_degree = max(dict(self.graph.degree()).values()) if self.graph.number_of_nodes() > 0 else 1
-            return degree / max_degree if max_degree > 0 else 0.0
-        except:
-            return 0.0
-    
-    def _check_shell_indicators(self, company_id: str) -> float:
-        """Check for shell company indicators"""
-        company = self.companies[self.companies['company_id'] == company_id].iloc[0]
-        
-        # Check for shared addresses
-        same_address = self.companies[
-            (self.companies['address'] == company['address']) &
-            (self.companies['company_id'] != company_id)
-        ]
-        
-        # Check for same registration year
-        same_year = self.companies[
-            (self.companies['registration_year'] == company['registration_year']) &
-            (self.companies['company_id'] != company_id)
-        ]
-        
-        address_score = min(len(same_address) / 5.0, 1.0)
-        year_score = min(len(same_year) / 10.0, 0.5)
-        
-        return address_score + year_score
-    
-    def _calculate_confidence(self, entity_id: str) -> float:
-        """Calculate confidence score based on data availability"""
-        if entity_id not in self.graph:
-            return 0.3
-        
-        # More connections = higher confidence
-        degree = self.graph.degree(entity_id)
-        return min(0.5 + (degree / 20.0), 1.0)
+        return indicators
     
     def get_risk_category(self, risk_score: float) -> RiskCategory:
         """Convert risk score to category"""
@@ -201,47 +175,62 @@ class RiskScoringEngine:
     
     def detect_fraud_clusters(self) -> List[List[str]]:
         """Detect fraud clusters using community detection"""
-        # Use Louvain method for community detection
-        partition = community_louvain.best_partition(self.graph)
-        
-        # Group entities by community
-        communities = {}
-        for node, comm_id in partition.items():
-            if comm_id not in communities:
-                communities[comm_id] = []
-            communities[comm_id].append(node)
+        fraud_labels = dict(zip(self.companies['company_id'], self.companies['fraud_label']))
         
         # Filter for suspicious clusters (high fraud concentration)
         fraud_clusters = []
-        for comm_id, members in communities.items():
+        for members in self._communities():
             company_members = [m for m in members if m.startswith('COMP_')]
             if len(company_members) < 3:
                 continue
             
             # Check fraud concentration
-            fraud_count = sum(1 for m in company_members 
-                            if self.companies[self.companies['company_id'] == m]['fraud_label'].iloc[0] == 1)
+            fraud_count = sum(1 for m in company_members if fraud_labels[m] == 1)
             
             if fraud_count / len(company_members) > 0.5:
                 fraud_clusters.append(company_members)
         
         return fraud_clusters
     
+    def _communities(self) -> List[List[str]]:
+        """Louvain communities of the entity graph, as lists of node IDs"""
+        if IGRAPH_AVAILABLE:
+            names = list(self.graph.nodes)
+            vertex_ids = {name: i for i, name in enumerate(names)}
+            g = ig.Graph(n=len(names), edges=[(vertex_ids[u], vertex_ids[v]) for u, v in self.graph.edges])
+            
+            # Seeded so every worker process detects the same clusters
+            ig.set_random_number_generator(random.Random(config.CLUSTER_RANDOM_STATE))
+            return [[names[i] for i in community] for community in g.community_multilevel()]
+        
+        # Use Louvain method for community detection
+        partition = community_louvain.best_partition(self.graph, random_state=config.CLUSTER_RANDOM_STATE)
+        
+        # Group entities by community
+        communities = {}
+        for node, comm_id in partition.items():
+            if comm_id not in communities:
+                communities[comm_id] = []
+            communities[comm_id].append(node)
+        return list(communities.values())
+    
     def calculate_all_risk_scores(self) -> pd.DataFrame:
         """Calculate risk scores for all companies"""
-        results = []
-        
-        for _, company in self.companies.iterrows():
-            company_id = company['company_id']
-            risk_score, confidence, indicators = self.calculate_company_risk_score(company_id)
-            risk_category = self.get_risk_category(risk_score)
-            
-            results.append({
-                'company_id': company_id,
-                'risk_score': risk_score,
-                'confidence_score': confidence,
-                'risk_category': risk_category.value,
-                'indicator_count': len(indicators)
-            })
-        
-        return pd.DataFrame(results)
+        company_ids = self.companies['company_id'].tolist()
+        factors, risk, confidence = self._score_arrays(company_ids)
+        
+        # Same thresholds as _build_indicators, counted without building the indicators
+        indicator_count = (
+            (factors[:, SHARED_DIRECTORS] > 0.3).astype(int) + (factors[:, WIN_PATTERN] > 0.4) +
+            (factors[:, CENTRALITY] > 0.5) + (factors[:, SHELL] > 0.5)
+        )
+        risk_category = np.where(risk >= 0.7, RiskCategory.HIGH.value,
+                                 np.where(risk >= 0.4, RiskCategory.MEDIUM.value, RiskCategory.LOW.value))
+        
+        return pd.DataFrame({
+            'company_id': company_ids,
+            'risk_score': risk,
+            'confidence_score': confidence,
+            'risk_category': risk_category,
+            'indicator_count': indicator_count
+        })
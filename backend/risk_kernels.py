@@ -0,0 +1,71 @@
+"""
+NetraAI Risk Kernels
+Compiled risk-factor arithmetic over per-company NumPy arrays
+"""
+
+import numpy as np
+from typing import Tuple
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in so kernels still run as plain Python"""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# Factor columns in the matrix returned by score_companies
+SHARED_DIRECTORS, WIN_PATTERN, CENTRALITY, SHELL = range(4)
+
+# Serial on purpose: the APIs call this from worker threads, which numba's
+# default parallel threading layer does not support
+@njit(cache=True)
+def score_companies(shared: np.ndarray, won_counts: np.ndarray, won_indptr: np.ndarray,
+                    won_values: np.ndarray, num_tenders: int, overall_mean: float,
+                    degrees: np.ndarray, max_degree: float,
+                    shell: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Factor matrix, risk scores and confidences; degrees of -1 mark nodes missing from the graph"""
+    n = len(shared)
+    factors = np.zeros((n, 4))
+    risk = np.zeros(n)
+    confidence = np.zeros(n)
+
+    for i in range(n):
+        # Win pattern - mean value of won tenders against the network mean
+        pattern = 0.0
+        start, end = won_indptr[i], won_indptr[i + 1]
+        if won_counts[i] > 0 and end > start:
+            total = 0.0
+            for j in range(start, end):
+                total += won_values[j]
+            avg_value = total / (end - start)
+            value_ratio = avg_value / overall_mean if overall_mean > 0 else 1.0
+            win_frequency = won_counts[i] / num_tenders
+            pattern = min((value_ratio - 1.0) * 0.5 + win_frequency * 2.0, 1.0)
+
+        degree = degrees[i]
+        if degree < 0:
+            centrality = 0.0
+            confidence[i] = 0.3
+        else:
+            centrality = degree / max_degree if max_degree > 0 else 0.0
+            confidence[i] = min(0.5 + (degree / 20.0), 1.0)
+
+        factors[i, SHARED_DIRECTORS] = shared[i]
+        factors[i, WIN_PATTERN] = pattern
+        factors[i, CENTRALITY] = centrality
+        factors[i, SHELL] = shell[i]
+
+        # Weighted sum of the four factors, capped at 1.0
+        total_risk = 0.0
+        total_risk += shared[i] * 0.25
+        total_risk += pattern * 0.30
+        total_risk += centrality * 0.20
+        total_risk += shell[i] * 0.25
+        risk[i] = min(total_risk, 1.0)
+
+    return factors, risk, confidence
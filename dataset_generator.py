@@ -1,13 +1,19 @@
 import pandas as pd
 import numpy as np
-import random
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Set, Tuple
+from typing import List, Dict, Optional, Set, Tuple
+
+# PyArrow's multithreaded C++ CSV writer when installed, pandas' to_csv otherwise
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
 
 RANDOM_SEED = 42
-random.seed(RANDOM_SEED)
-np.random.seed(RANDOM_SEED)
 
 NUM_COMPANIES = 500
 NUM_DIRECTORS = 200
@@ -16,26 +22,83 @@ NUM_DEPARTMENTS = 20
 FRAUD_CLUSTER_SIZE = 7 
 SHELL_CLUSTER_SIZE = 6 
 PROLIFIC_DIRECTOR_THRESHOLD = 6  
+MAX_BIDDERS = 7
 
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "data", "raw")
 
+# Relationship type codes and the entity kinds at each end
+DIRECTOR_OF, BIDDED_FOR, WON, ISSUED_BY = range(4)
+RELATIONSHIP_TYPES = ('DIRECTOR_OF', 'BIDDED_FOR', 'WON', 'ISSUED_BY')
+RELATIONSHIP_ENDPOINTS = (('director', 'company'), ('company', 'tender'),
+                          ('company', 'tender'), ('tender', 'department'))
+
+# IDs are int32 indices during generation and only rendered as strings like COMP_0042 on save
+ID_FORMATS = {'company': ('COMP_', 4), 'director': ('DIR_', 4),
+              'tender': ('TEND_', 4), 'department': ('DEPT_', 2)}
+ID_COLUMNS = {'company_id': 'company', 'director_id': 'director', 'tender_id': 'tender',
+              'department_id': 'department', 'winning_company_id': 'company'}
+
+class RelationshipBuffer:
+    """Growable columnar store of (source index, target index, type code) edges"""
+    
+    def __init__(self, capacity: int = 1024):
+        self.source_idx = np.empty(capacity, dtype=np.int32)
+        self.target_idx = np.empty(capacity, dtype=np.int32)
+        self.rel_type_code = np.empty(capacity, dtype=np.int8)
+        self.size = 0
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def add_batch(self, source_idx, target_idx, rel_type_code: int) -> None:
+        """Append a batch of edges; a scalar index is broadcast"""
+        source_idx, target_idx = np.broadcast_arrays(source_idx, target_idx)
+        n = source_idx.size
+        end = self.size + n
+        if end > len(self.source_idx):
+            self._grow(end)
+        self.source_idx[self.size:end] = source_idx.ravel()
+        self.target_idx[self.size:end] = target_idx.ravel()
+        self.rel_type_code[self.size:end] = rel_type_code
+        self.size = end
+    
+    def _grow(self, required: int) -> None:
+        # Doubling keeps appends amortised O(1)
+        capacity = max(len(self.source_idx), 1)
+        while capacity < required:
+            capacity *= 2
+        for name in ('source_idx', 'target_idx', 'rel_type_code'):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+    
+    def to_dataframe(self) -> pd.DataFrame:
+        """Materialize edges in insertion order, keeping integer endpoint indices"""
+        return pd.DataFrame({
+            'source_id': self.source_idx[:self.size].copy(),
+            'target_id': self.target_idx[:self.size].copy(),
+            'relationship_type': pd.Categorical.from_codes(self.rel_type_code[:self.size], RELATIONSHIP_TYPES)
+        })
+
 class ProcurementDataGenerator:
     def __init__(self, seed=RANDOM_SEED):
-        random.seed(seed)
-        np.random.seed(seed)
         self.seed = seed
+        self.rng = np.random.default_rng(seed)
+
   
-        self.companies = []
-        self.directors = []
-        self.tenders = []
-        self.departments = []
-        self.relationships = []
+        self.companies = pd.DataFrame()
+        self.directors = pd.DataFrame()
+        self.tenders = pd.DataFrame()
+        self.departments = pd.DataFrame()
+        self.rel_buffer = RelationshipBuffer()
       
-        self.fraudulent_companies = set()
-        self.fraudulent_directors = set()
-        self.fraudulent_tenders = set()
+        # Row positions of fraudulent entities, one array per injected group
+        self._fraud_company_idx: List[np.ndarray] = []
+        self._fraud_director_idx: List[np.ndarray] = []
+        self._fraud_tender_idx: List[np.ndarray] = []
         
-    def generate_companies(self) -> pd.DataFrame:
+    def generate_companies(self, rng: Optional[np.random.Generator] = None) -> pd.DataFrame:
         print("[1/6] Generating companies...")
         
         industries = [
@@ -44,25 +107,29 @@ class ProcurementDataGenerator:
             "Consulting", "Security Services", "Architecture", "Finance"
         ]
         
-        for i in range(NUM_COMPANIES):
-            company_id = f"COMP_{i:04d}"
-            name = f"{self._generate_company_name()} {random.choice(['Ltd.', 'Inc.', 'corp.', 'LLC'])}"
-            registration_year = random.randint(1995, 2023)
-            industry = random.choice(industries)
-            address = f"{random.randint(1, 999)} {random.choice(['Main', 'Oak', 'Elm', 'Park', 'Central'])} St, {random.choice(['City', 'Town', 'Village'])} {random.randint(10000, 99999)}"
-            
-            self.companies.append({
-                'company_id': company_id,
-                'name': name,
-                'registration_year': registration_year,
-                'industry_type': industry,
-                'address': address,
-                'fraud_label': 0
-            })
-        
-        return pd.DataFrame(self.companies)
+        # Every field is drawn for all companies at once
+        rng = self.rng if rng is None else rng
+        names = _concat(self._generate_company_names(NUM_COMPANIES, rng), ' ',
+                        rng.choice(['Ltd.', 'Inc.', 'corp.', 'LLC'], NUM_COMPANIES))
+        addresses = _concat(
+            rng.integers(1, 1000, NUM_COMPANIES).astype(str), ' ',
+            rng.choice(['Main', 'Oak', 'Elm', 'Park', 'Central'], NUM_COMPANIES), ' St, ',
+            rng.choice(['City', 'Town', 'Village'], NUM_COMPANIES), ' ',
+            rng.integers(10000, 100000, NUM_COMPANIES).astype(str)
+        )
+        
+        self.companies = pd.DataFrame({
+            'company_id': np.arange(NUM_COMPANIES, dtype=np.int32),
+            'name': names,
+            'registration_year': rng.integers(1995, 2024, NUM_COMPANIES),
+            'industry_type': rng.choice(industries, NUM_COMPANIES),
+            'address': addresses,
+            'fraud_label': 0
+        })
+        
+        return self.companies
     
-    def generate_directors(self) -> pd.DataFrame:
+    def generate_directors(self, rng: Optional[np.random.Generator] = None) -> pd.DataFrame:
         print("[2/6] Generating directors...")
         
         first_names = [
@@ -74,40 +141,30 @@ class ProcurementDataGenerator:
             "Malkan", "Lotia", "Kapoor", "Raghani", "Janani", "Dhruve", "Bhuptani"
         ]
         
-        for i in range(NUM_DIRECTORS):
-            director_id = f"DIR_{i:04d}"
-            name = f"{random.choice(first_names)} {random.choice(last_names)}"
-            age = random.randint(30, 75)
-            
-            self.directors.append({
-                'director_id': director_id,
-                'name': name,
-                'age': age,
-                'fraud_label': 0
-            })
-        
-        return pd.DataFrame(self.directors)
+        rng = self.rng if rng is None else rng
+        self.directors = pd.DataFrame({
+            'director_id': np.arange(NUM_DIRECTORS, dtype=np.int32),
+            'name': _concat(rng.choice(first_names, NUM_DIRECTORS), ' ', rng.choice(last_names, NUM_DIRECTORS)),
+            'age': rng.integers(30, 76, NUM_DIRECTORS),
+            'fraud_label': 0
+        })
+        
+        return self.directors
     
-    def generate_tenders(self) -> pd.DataFrame:
+    def generate_tenders(self, rng: Optional[np.random.Generator] = None) -> pd.DataFrame:
         print("[3/6] Generating tenders...")
         
-        for i in range(NUM_TENDERS):
-            tender_id = f"TEND_{i:04d}"
-            department_id = f"DEPT_{random.randint(0, NUM_DEPARTMENTS-1):02d}"
-            contract_value = random.randint(50000, 5000000)
-            year = random.randint(2018, 2023)
-            winning_company_id = f"COMP_{random.randint(0, NUM_COMPANIES-1):04d}"
-            
-            self.tenders.append({
-                'tender_id': tender_id,
-                'department_id': department_id,
-                'contract_value': contract_value,
-                'year': year,
-                'winning_company_id': winning_company_id,
-                'fraud_label': 0
-            })
-        
-        return pd.DataFrame(self.tenders)
+        rng = self.rng if rng is None else rng
+        self.tenders = pd.DataFrame({
+            'tender_id': np.arange(NUM_TENDERS, dtype=np.int32),
+            'department_id': rng.integers(0, NUM_DEPARTMENTS, NUM_TENDERS).astype(np.int32),
+            'contract_value': rng.integers(50000, 5000001, NUM_TENDERS),
+            'year': rng.integers(2018, 2024, NUM_TENDERS),
+            'winning_company_id': rng.integers(0, NUM_COMPANIES, NUM_TENDERS).astype(np.int32),
+            'fraud_label': 0
+        })
+        
+        return self.tenders
     
     def generate_departments(self) -> pd.DataFrame:
         print("[4/6] Generating departments...")
@@ -125,257 +182,180 @@ class ProcurementDataGenerator:
             "Ministry of Labor", "Department of Veterans Services"
         ]
         
-        for i in range(NUM_DEPARTMENTS):
-            dept_id = f"DEPT_{i:02d}"
-            name = dept_names[i % len(dept_names)]
-            location = f"Capital City, Region {i % 5 + 1}"
-            
-            self.departments.append({
-                'department_id': dept_id,
-                'name': name,
-                'location': location
-            })
+        region = np.arange(NUM_DEPARTMENTS) % 5 + 1
+        self.departments = pd.DataFrame({
+            'department_id': np.arange(NUM_DEPARTMENTS, dtype=np.int32),
+            'name': np.array(dept_names)[np.arange(NUM_DEPARTMENTS) % len(dept_names)],
+            'location': _concat('Capital City, Region ', region.astype(str))
+        })
         
-        return pd.DataFrame(self.departments)
+        return self.departments
     
-    def create_director_company_relationships(self) -> None:
+    def create_director_company_relationships(self) -> np.ndarray:
         print("[5a/6] Creating director-company relationships...")
         
-        director_company_count = {}  # Track how many companies each director is linked to
+        # Companies per director, then one company draw per link
+        counts = self.rng.integers(1, 5, NUM_DIRECTORS)
+        self.rel_buffer.add_batch(
+            np.repeat(np.arange(NUM_DIRECTORS), counts),
+            self.rng.integers(0, NUM_COMPANIES, counts.sum()),
+            DIRECTOR_OF
+        )
         
-        for director_idx in range(NUM_DIRECTORS):
-            director_id = f"DIR_{director_idx:04d}"
-            num_companies = random.randint(1, 4)
-            
-            for _ in range(num_companies):
-                company_idx = random.randint(0, NUM_COMPANIES - 1)
-                company_id = f"COMP_{company_idx:04d}"
-                
-                self.relationships.append({
-                    'source_id': director_id,
-                    'target_id': company_id,
-                    'relationship_type': 'DIRECTOR_OF'
-                })
-                
-                director_company_count[director_id] = director_company_count.get(director_id, 0) + 1
-        
-        return director_company_count
+        return counts
     
-    def create_company_tender_relationships(self, company_df: pd.DataFrame) -> None:
+    def create_company_tender_relationships(self, tender_df: pd.DataFrame) -> None:
         print("[5b/6] Creating company-tender relationships...")
         
-        for tender_idx, tender_row in company_df.iterrows():
-            tender_id = f"TEND_{tender_idx:04d}"
-            
-            num_bidders = random.randint(3, 7)
-            
-            bidding_companies = set()
-            for _ in range(num_bidders):
-                company_idx = random.randint(0, NUM_COMPANIES - 1)
-                bidding_companies.add(f"COMP_{company_idx:04d}")
-            
-            for company_id in bidding_companies:
-                self.relationships.append({
-                    'source_id': company_id,
-                    'target_id': tender_id,
-                    'relationship_type': 'BIDDED_FOR'
-                })
-            
-            winning_company_id = f"COMP_{random.randint(0, NUM_COMPANIES-1):04d}"
-            self.relationships.append({
-                'source_id': winning_company_id,
-                'target_id': tender_id,
-                'relationship_type': 'WON'
-            })
+        num_tenders = len(tender_df)
+        
+        # 3-7 bidder draws per tender; unused slots get a sentinel past the last company
+        num_bidders = self.rng.integers(3, MAX_BIDDERS + 1, num_tenders)
+        draws = self.rng.integers(0, NUM_COMPANIES, (num_tenders, MAX_BIDDERS))
+        draws[np.arange(MAX_BIDDERS) >= num_bidders[:, None]] = NUM_COMPANIES
+        
+        # Repeated draws collapse into one bid, as a set would
+        draws.sort(axis=1)
+        keep = draws < NUM_COMPANIES
+        keep[:, 1:] &= draws[:, 1:] != draws[:, :-1]
+        tender_idx, _ = np.nonzero(keep)
+        
+        self.rel_buffer.add_batch(draws[keep], tender_idx, BIDDED_FOR)
+        self.rel_buffer.add_batch(self.rng.integers(0, NUM_COMPANIES, num_tenders), np.arange(num_tenders), WON)
     
     def create_tender_department_relationships(self, tender_df: pd.DataFrame) -> None:
         """Create ISSUED_BY relationships"""
         print("[5c/6] Creating tender-department relationships...")
         
-        for _, tender_row in tender_df.iterrows():
-            tender_id = tender_row['tender_id']
-            dept_id = tender_row['department_id']
-            
-            self.relationships.append({
-                'source_id': tender_id,
-                'target_id': dept_id,
-                'relationship_type': 'ISSUED_BY'
-            })
+        self.rel_buffer.add_batch(tender_df['tender_id'].to_numpy(), tender_df['department_id'].to_numpy(), ISSUED_BY)
     
     def inject_fraud_patterns(self, company_df: pd.DataFrame, 
                              director_df: pd.DataFrame,
                              tender_df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """Inject fraud patterns, modifying the given frames in place"""
         print("[6/6] Injecting fraud patterns...")
         
-        company_df_copy = company_df.copy()
-        director_df_copy = director_df.copy()
-        tender_df_copy = tender_df.copy()
-        
-        self._inject_shared_directors(company_df_copy, director_df_copy)
-        self._inject_collusive_cluster(company_df_copy, tender_df_copy)
-        self._inject_shell_companies(company_df_copy)
-        self._inject_prolific_directors(company_df_copy, director_df_copy)
-        self._inject_high_contract_winners(company_df_copy, tender_df_copy)
-        self._inject_circular_ownership(company_df_copy, director_df_copy)
+        self._inject_shared_directors(company_df, director_df)
+        self._inject_collusive_cluster(company_df, tender_df)
+        self._inject_shell_companies(company_df)
+        self._inject_prolific_directors(company_df, director_df)
+        self._inject_high_contract_winners(company_df, tender_df)
+        self._inject_circular_ownership(company_df, director_df)
         
-        return company_df_copy, director_df_copy, tender_df_copy
+        return company_df, director_df, tender_df
     
     def _inject_shared_directors(self, company_df: pd.DataFrame, director_df: pd.DataFrame) -> None:
         print("  Injecting Pattern 1: Shared Directors...")
         
+        rng = self.rng
         for group in range(5):
-            shared_director_idx = random.randint(0, NUM_DIRECTORS - 1)
-            shared_director_id = f"DIR_{shared_director_idx:04d}"
-            
-            group_companies = random.sample(range(NUM_COMPANIES), k=random.randint(3, 4))
+            shared_director_idx = int(rng.integers(NUM_DIRECTORS))
+            group_companies = rng.choice(NUM_COMPANIES, size=int(rng.integers(3, 5)), replace=False)
             
-            for company_idx in group_companies:
-                company_id = f"COMP_{company_idx:04d}"
-                self.relationships.append({
-                    'source_id': shared_director_id,
-                    'target_id': company_id,
-                    'relationship_type': 'DIRECTOR_OF'
-                })
-                
-                self.fraudulent_companies.add(company_id)
-                self.fraudulent_directors.add(shared_director_id)
+            self.rel_buffer.add_batch(shared_director_idx, group_companies, DIRECTOR_OF)
+            self._fraud_company_idx.append(group_companies)
+            self._fraud_director_idx.append(np.array([shared_director_idx]))
     
     def _inject_collusive_cluster(self, company_df: pd.DataFrame, tender_df: pd.DataFrame) -> None:
         print("  Injecting Pattern 2: Collusive Cluster...")
         
-        num_clusters = random.randint(3, 4)
+        rng = self.rng
+        num_clusters = int(rng.integers(3, 5))
+        
+        # Every cluster targets the same top 15% of tenders by value
+        high_value_tenders = tender_df.index.get_indexer(tender_df.nlargest(int(NUM_TENDERS * 0.15), 'contract_value').index)
+        num_high_value = len(high_value_tenders)
         
         for cluster in range(num_clusters):
-            cluster_companies = random.sample(range(NUM_COMPANIES), k=FRAUD_CLUSTER_SIZE)
-            cluster_company_ids = [f"COMP_{idx:04d}" for idx in cluster_companies]
-            
-            high_value_tenders = tender_df.nlargest(int(NUM_TENDERS * 0.15), 'contract_value')
+            cluster_companies = rng.choice(NUM_COMPANIES, size=FRAUD_CLUSTER_SIZE, replace=False)
             
-            for _, tender_row in high_value_tenders.iterrows():
-                tender_id = tender_row['tender_id']
-                
-                for company_id in cluster_company_ids:
-                    self.relationships.append({
-                        'source_id': company_id,
-                        'target_id': tender_id,
-                        'relationship_type': 'BIDDED_FOR'
-                    })
-                
-                winner = random.choice(cluster_company_ids)
-                self.relationships.append({
-                    'source_id': winner,
-                    'target_id': tender_id,
-                    'relationship_type': 'WON'
-                })
-                
-                self.fraudulent_tenders.add(tender_id)
+            # Every cluster member bids on every tender; one member wins each
+            self.rel_buffer.add_batch(
+                np.tile(cluster_companies, num_high_value),
+                np.repeat(high_value_tenders, FRAUD_CLUSTER_SIZE),
+                BIDDED_FOR
+            )
+            self.rel_buffer.add_batch(rng.choice(cluster_companies, num_high_value), high_value_tenders, WON)
             
-            self.fraudulent_companies.update(cluster_company_ids)
+            self._fraud_tender_idx.append(high_value_tenders)
+            self._fraud_company_idx.append(cluster_companies)
     
     def _inject_shell_companies(self, company_df: pd.DataFrame) -> None:
         print("  Injecting Pattern 3: Shell Companies...")
         
-        num_shell_groups = random.randint(3, 4)
+        rng = self.rng
+        num_shell_groups = int(rng.integers(3, 5))
         
         for group in range(num_shell_groups):
-            shell_year = random.randint(2018, 2023)
-            shell_addresses = [f"{random.randint(1, 10)} Dummy Street, Shell City 00000"]
+            shell_year = int(rng.integers(2018, 2024))
+            shell_address = f"{int(rng.integers(1, 11))} Dummy Street, Shell City 00000"
             
-            shell_indices = random.sample(range(NUM_COMPANIES), k=SHELL_CLUSTER_SIZE)
+            shell_indices = rng.choice(NUM_COMPANIES, size=SHELL_CLUSTER_SIZE, replace=False)
             
-            for idx in shell_indices:
-                company_df.at[idx, 'registration_year'] = shell_year
-                company_df.at[idx, 'address'] = shell_addresses[0]
-                company_df.at[idx, 'fraud_label'] = 1
-                
-                company_id = f"COMP_{idx:04d}"
-                self.fraudulent_companies.add(company_id)
+            company_df.loc[shell_indices, 'registration_year'] = shell_year
+            company_df.loc[shell_indices, 'address'] = shell_address
+            company_df.loc[shell_indices, 'fraud_label'] = 1
+            self._fraud_company_idx.append(shell_indices)
     
     def _inject_prolific_directors(self, company_df: pd.DataFrame, director_df: pd.DataFrame) -> None:
         print("  Injecting Pattern 4: Prolific Directors...")
         
-        prolific_count = random.randint(5, 8)
-        prolific_directors = random.sample(range(NUM_DIRECTORS), k=prolific_count)
+        rng = self.rng
+        prolific_count = int(rng.integers(5, 9))
+        prolific_directors = rng.choice(NUM_DIRECTORS, size=prolific_count, replace=False)
         
         for director_idx in prolific_directors:
-            director_id = f"DIR_{director_idx:04d}"
-            num_linked = random.randint(15, 25)
-            linked_companies = random.sample(range(NUM_COMPANIES), k=num_linked)
+            num_linked = int(rng.integers(15, 26))
+            linked_companies = rng.choice(NUM_COMPANIES, size=num_linked, replace=False)
             
-            for company_idx in linked_companies:
-                company_id = f"COMP_{company_idx:04d}"
-                
-                self.relationships.append({
-                    'source_id': director_id,
-                    'target_id': company_id,
-                    'relationship_type': 'DIRECTOR_OF'
-                })
-                
-                self.fraudulent_directors.add(director_id)
-                self.fraudulent_companies.add(company_id)
+            self.rel_buffer.add_batch(director_idx, linked_companies, DIRECTOR_OF)
+            self._fraud_director_idx.append(np.array([director_idx]))
+            self._fraud_company_idx.append(linked_companies)
     
     def _inject_high_contract_winners(self, company_df: pd.DataFrame, tender_df: pd.DataFrame) -> None:
         print("  Injecting Pattern 5: High Contract Winners...")
-        high_value_companies = random.sample(range(NUM_COMPANIES), k=random.randint(5, 7))
+        rng = self.rng
+        high_value_companies = rng.choice(NUM_COMPANIES, size=int(rng.integers(5, 8)), replace=False)
+        
+        # Tenders above the upper quartile, computed once for all companies
+        high_value_mask = tender_df['contract_value'] > tender_df['contract_value'].quantile(0.75)
+        high_tenders = np.flatnonzero(high_value_mask.to_numpy())
         
         for company_idx in high_value_companies:
-            company_id = f"COMP_{company_idx:04d}"
-            high_tenders = tender_df[tender_df['contract_value'] > tender_df['contract_value'].quantile(0.75)]
-            num_wins = min(random.randint(5, 10), len(high_tenders))
-            winning_tenders = random.sample(list(high_tenders['tender_id']), k=num_wins)
+            num_wins = min(int(rng.integers(5, 11)), len(high_tenders))
+            winning_tenders = rng.choice(high_tenders, size=num_wins, replace=False)
             
-            for tender_id in winning_tenders:
-                self.relationships.append({
-                    'source_id': company_id,
-                    'target_id': tender_id,
-                    'relationship_type': 'WON'
-                })
-                
-                self.fraudulent_companies.add(company_id)
-                self.fraudulent_tenders.add(tender_id)
+            self.rel_buffer.add_batch(company_idx, winning_tenders, WON)
+            self._fraud_company_idx.append(np.array([company_idx]))
+            self._fraud_tender_idx.append(winning_tenders)
     
     def _inject_circular_ownership(self, company_df: pd.DataFrame, director_df: pd.DataFrame) -> None:
         print("  Injecting Pattern 6: Circular Ownership...")
-        num_circles = random.randint(2, 3)
+        rng = self.rng
+        num_circles = int(rng.integers(2, 4))
         
         for circle in range(num_circles):
-            circle_size = random.randint(3, 5)
+            circle_size = int(rng.integers(3, 6))
             
-            circle_companies = random.sample(range(NUM_COMPANIES), k=circle_size)
-            circle_directors = random.sample(range(NUM_DIRECTORS), k=circle_size)
-            for i in range(circle_size):
-                company_id = f"COMP_{circle_companies[i]:04d}"
-                director_id = f"DIR_{circle_directors[(i + 1) % circle_size]:04d}"
-                
-                self.relationships.append({
-                    'source_id': director_id,
-                    'target_id': company_id,
-                    'relationship_type': 'DIRECTOR_OF'
-                })
-                
-                self.fraudulent_companies.add(company_id)
-                self.fraudulent_directors.add(director_id)
+            circle_companies = rng.choice(NUM_COMPANIES, size=circle_size, replace=False)
+            circle_directors = rng.choice(NUM_DIRECTORS, size=circle_size, replace=False)
+            
+            # Company i is run by the next director round the circle
+            self.rel_buffer.add_batch(np.roll(circle_directors, -1), circle_companies, DIRECTOR_OF)
+            self._fraud_company_idx.append(circle_companies)
+            self._fraud_director_idx.append(circle_directors)
     
     def mark_fraudulent_entities(self, company_df: pd.DataFrame, 
                                 director_df: pd.DataFrame,
                                 tender_df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
-        """Mark fraudulent entities with fraud_label = 1"""
-        company_df_copy = company_df.copy()
-        director_df_copy = director_df.copy()
-        tender_df_copy = tender_df.copy()
-        for company_id in self.fraudulent_companies:
-            idx = int(company_id.split('_')[1])
-            company_df_copy.at[idx, 'fraud_label'] = 1
-    
-        for director_id in self.fraudulent_directors:
-            idx = int(director_id.split('_')[1])
-            director_df_copy.at[idx, 'fraud_label'] = 1
-        
-        for tender_id in self.fraudulent_tenders:
-            idx = int(tender_id.split('_')[1])
-            tender_df_copy.at[idx, 'fraud_label'] = 1
-        
-        return company_df_copy, director_df_copy, tender_df_copy
+        """Mark fraudulent entities with fraud_label = 1, in place"""
+        # Injectors recorded row positions, so labels are set positionally with no ID lookups
+        for df, chunks in ((company_df, self._fraud_company_idx),
+                           (director_df, self._fraud_director_idx),
+                           (tender_df, self._fraud_tender_idx)):
+            df.iloc[_unique_positions(chunks), df.columns.get_loc('fraud_label')] = 1
+        
+        return company_df, director_df, tender_df
     
     def generate(self) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
         """Generate complete synthetic dataset"""
@@ -383,10 +363,18 @@ class ProcurementDataGenerator:
         print("STARTING SYNTHETIC PROCUREMENT DATASET GENERATION")
         print("="*60 + "\n")
         
-        company_df = self.generate_companies()
-        director_df = self.generate_directors()
-        tender_df = self.generate_tenders()
-        department_df = self.generate_departments()
+        # Entity tables are independent; each gets its own spawned stream so output
+        # does not depend on thread scheduling
+        company_rng, director_rng, tender_rng = [
+            np.random.default_rng(child) for child in np.random.SeedSequence(self.seed).spawn(3)
+        ]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            companies = executor.submit(self.generate_companies, company_rng)
+            directors = executor.submit(self.generate_directors, director_rng)
+            tenders = executor.submit(self.generate_tenders, tender_rng)
+            departments = executor.submit(self.generate_departments)
+            company_df, director_df = companies.result(), directors.result()
+            tender_df, department_df = tenders.result(), departments.result()
         
         self.create_director_company_relationships()
         self.create_company_tender_relationships(tender_df)
@@ -400,6 +388,8 @@ class ProcurementDataGenerator:
             company_df, director_df, tender_df
         )
         
+        relationship_df = self.rel_buffer.to_dataframe()
+        
         print("\n" + "="*60)
         print("DATASET GENERATION COMPLETE")
         print("="*60 + "\n")
@@ -409,10 +399,10 @@ class ProcurementDataGenerator:
         print(f"  Directors: {len(director_df)} (Fraudulent: {director_df['fraud_label'].sum()})")
         print(f"  Tenders: {len(tender_df)} (Fraudulent: {tender_df['fraud_label'].sum()})")
         print(f"  Departments: {len(department_df)}")
-        print(f"  Relationships: {len(self.relationships)}")
+        print(f"  Relationships: {len(relationship_df)}")
         print()
         
-        return company_df, director_df, tender_df, department_df, pd.DataFrame(self.relationships)
+        return company_df, director_df, tender_df, department_df, relationship_df
     
     def save(self, company_df: pd.DataFrame, director_df: pd.DataFrame,
              tender_df: pd.DataFrame, department_df: pd.DataFrame,
@@ -421,11 +411,12 @@ class ProcurementDataGenerator:
         
         os.makedirs(OUTPUT_DIR, exist_ok=True)
         
-        company_df.to_csv(os.path.join(OUTPUT_DIR, 'companies.csv'), index=False)
-        director_df.to_csv(os.path.join(OUTPUT_DIR, 'directors.csv'), index=False)
-        tender_df.to_csv(os.path.join(OUTPUT_DIR, 'tenders.csv'), index=False)
-        department_df.to_csv(os.path.join(OUTPUT_DIR, 'departments.csv'), index=False)
-        relationship_df.to_csv(os.path.join(OUTPUT_DIR, 'relationships.csv'), index=False)
+        company_df = company_df.astype({'industry_type': 'category'})
+        _write_csv(_render_ids(company_df), os.path.join(OUTPUT_DIR, 'companies.csv'))
+        _write_csv(_render_ids(director_df), os.path.join(OUTPUT_DIR, 'directors.csv'))
+        _write_csv(_render_ids(tender_df), os.path.join(OUTPUT_DIR, 'tenders.csv'))
+        _write_csv(_render_ids(department_df), os.path.join(OUTPUT_DIR, 'departments.csv'))
+        _write_csv(_render_relationship_ids(relationship_df), os.path.join(OUTPUT_DIR, 'relationships.csv'))
         
         print(f"✓ Datasets saved to: {OUTPUT_DIR}\n")
         print("Files created:")
@@ -435,14 +426,58 @@ class ProcurementDataGenerator:
         print(f"  - departments.csv ({len(department_df)} rows)")
         print(f"  - relationships.csv ({len(relationship_df)} rows)")
     
-    @staticmethod
-    def _generate_company_name() -> str:
+    def _generate_company_names(self, n: int, rng: np.random.Generator) -> np.ndarray:
         prefixes = ["Tech", "Global", "Smart", "Prime", "Elite", "Forward", 
                    "Dynamic", "Apex", "Nexus", "Quantum", "Venture", "Summit"]
         middles = ["Solutions", "Systems", "Services", "Group", "Holdings", 
                   "Enterprises", "Industries", "Ventures", "Labs"]
         
-        return f"{random.choice(prefixes)} {random.choice(middles)}"
+        return _concat(rng.choice(prefixes, n), ' ', rng.choice(middles, n))
+
+
+def _write_csv(df: pd.DataFrame, path: str) -> None:
+    """Write a frame as CSV; Arrow quotes every string field, which parses back identically"""
+    if PYARROW_AVAILABLE:
+        pv.write_csv(pa.Table.from_pandas(df, preserve_index=False), path)
+    else:
+        df.to_csv(path, index=False)
+
+def _format_ids(kind: str, idx: np.ndarray) -> np.ndarray:
+    """Zero-padded IDs like COMP_0042 for integer indices, formatted in one vectorized pass"""
+    prefix, width = ID_FORMATS[kind]
+    return np.char.add(prefix, np.char.zfill(np.asarray(idx).astype(str), width))
+
+def _render_ids(df: pd.DataFrame) -> pd.DataFrame:
+    """Copy of an entity frame with its integer ID columns rendered as strings"""
+    return df.assign(**{column: _format_ids(kind, df[column].to_numpy())
+                        for column, kind in ID_COLUMNS.items() if column in df.columns})
+
+def _render_relationship_ids(relationship_df: pd.DataFrame) -> pd.DataFrame:
+    """Copy of the edge frame with endpoints rendered by relationship type; categories follow RELATIONSHIP_TYPES"""
+    codes = relationship_df['relationship_type'].cat.codes.to_numpy()
+    source_idx = relationship_df['source_id'].to_numpy()
+    target_idx = relationship_df['target_id'].to_numpy()
+    sources = np.empty(len(codes), dtype=object)
+    targets = np.empty(len(codes), dtype=object)
+    for code, (source_kind, target_kind) in enumerate(RELATIONSHIP_ENDPOINTS):
+        mask = codes == code
+        sources[mask] = _format_ids(source_kind, source_idx[mask])
+        targets[mask] = _format_ids(target_kind, target_idx[mask])
+    
+    return relationship_df.assign(source_id=sources.astype(str), target_id=targets.astype(str))
+
+def _unique_positions(chunks: List[np.ndarray]) -> np.ndarray:
+    """Sorted distinct row positions across index arrays"""
+    if not chunks:
+        return np.empty(0, dtype=np.intp)
+    return np.unique(np.concatenate(chunks)).astype(np.intp)
+
+def _concat(*parts) -> np.ndarray:
+    """Element-wise string concatenation of arrays and scalars"""
+    result = parts[0]
+    for part in parts[1:]:
+        result = np.char.add(result, part)
+    return result
 
 
 if __name__ == "__main__":
@@ -3,11 +3,17 @@ import os
 
 data_dir = 'data/raw'
 
-companies = pd.read_csv(os.path.join(data_dir, 'companies.csv'))
-directors = pd.read_csv(os.path.join(data_dir, 'directors.csv'))
-tenders = pd.read_csv(os.path.join(data_dir, 'tenders.csv'))
-departments = pd.read_csv(os.path.join(data_dir, 'departments.csv'))
-relationships = pd.read_csv(os.path.join(data_dir, 'relationships.csv'))
+# Low-cardinality strings as categoricals, labels as int8
+DTYPES = {'industry_type': 'category', 'relationship_type': 'category', 'fraud_label': 'int8'}
+
+# Only the columns summarised below are parsed
+companies = pd.read_csv(os.path.join(data_dir, 'companies.csv'), dtype=DTYPES,
+                        usecols=['fraud_label', 'industry_type', 'registration_year'])
+directors = pd.read_csv(os.path.join(data_dir, 'directors.csv'), dtype=DTYPES, usecols=['fraud_label'])
+tenders = pd.read_csv(os.path.join(data_dir, 'tenders.csv'), dtype=DTYPES,
+                      usecols=['fraud_label', 'year', 'contract_value'])
+departments = pd.read_csv(os.path.join(data_dir, 'departments.csv'), usecols=['department_id'])
+relationships = pd.read_csv(os.path.join(data_dir, 'relationships.csv'), dtype=DTYPES, usecols=['relationship_type'])
 
 print('='*70)
 print('NETRAAI SYNTHETIC PROCUREMENT DATASET - FINAL SUMMARY')
@@ -23,25 +29,28 @@ print(f'  Relationships:  {len(relationships)} records')
 print()
 
 print('FRAUD DISTRIBUTION:')
-print(f'  Fraudulent Companies: {companies["fraud_label"].sum()} ({companies["fraud_label"].sum()/len(companies)*100:.1f}%)')
-print(f'  Fraudulent Directors: {directors["fraud_label"].sum()} ({directors["fraud_label"].sum()/len(directors)*100:.1f}%)')
-print(f'  Fraudulent Tenders:   {tenders["fraud_label"].sum()} ({tenders["fraud_label"].sum()/len(tenders)*100:.1f}%)')
+for label, df in (('Companies:', companies), ('Directors:', directors), ('Tenders:  ', tenders)):
+    fraudulent = int(df['fraud_label'].sum())
+    print(f'  Fraudulent {label} {fraudulent} ({fraudulent/len(df)*100:.1f}%)')
 print()
 
 print('COMPANY ATTRIBUTES:')
 print(f'  Industries: {companies["industry_type"].nunique()} unique')
-print(f'  Reg. Years: {companies["registration_year"].min()}-{companies["registration_year"].max()}')
+reg_years = companies['registration_year'].agg(['min', 'max'])
+print(f'  Reg. Years: {reg_years["min"]}-{reg_years["max"]}')
 print()
 
 print('TENDER ATTRIBUTES:')
-print(f'  Year Range:         {tenders["year"].min()}-{tenders["year"].max()}')
-print(f'  Contract Value:     \u20B9{tenders["contract_value"].min():,.0f} - \u20B9{tenders["contract_value"].max():,.0f}')
-print(f'  Avg Contract Value: \u20B9{tenders["contract_value"].mean():,.0f}')
+years = tenders['year'].agg(['min', 'max'])
+contract = tenders['contract_value'].agg(['min', 'max', 'mean'])
+print(f'  Year Range:         {years["min"]}-{years["max"]}')
+print(f'  Contract Value:     \u20B9{contract["min"]:,.0f} - \u20B9{contract["max"]:,.0f}')
+print(f'  Avg Contract Value: \u20B9{contract["mean"]:,.0f}')
 print()
 
 print('RELATIONSHIP TYPES:')
-for rel_type in relationships['relationship_type'].unique():
-    count = len(relationships[relationships['relationship_type'] == rel_type])
+# One pass over the category codes instead of a filtered scan per type
+for rel_type, count in relationships['relationship_type'].value_counts().items():
     print(f'  {rel_type}: {count}')
 print()
 